@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from app.core.pagination import page_size, set_next_cursor
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserResponse, UserChangePassword, UserLogin
 from app.services.user_service import UserService
@@ -70,17 +71,34 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
         raise HTTPException(status_code=401, detail=str(e))
     
 @router.get("/users", response_model=list[UserResponse])
-def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    username: str | None = None,
+    db: Session = Depends(get_db),
+):
     """
-    Lấy danh sách tất cả người dùng.
+    Lấy danh sách người dùng theo trang, sắp theo id.
 
     Args:
+        limit: Số người dùng mỗi trang (mặc định PAGE_SIZE_DEFAULT, tối đa PAGE_SIZE_MAX).
+        cursor: Giá trị header X-Next-Cursor của trang trước.
+        username: Lọc theo phần đầu username.
         db: SQLAlchemy session.
 
     Returns:
-        list[UserResponse]: Danh sách thông tin tất cả người dùng (id, username, role).
+        list[UserResponse]: Danh sách người dùng (id, username, role); header X-Next-Cursor chứa cursor trang sau nếu còn.
+
+    Raises:
+        HTTPException: Nếu cursor không hợp lệ (status code 400).
     """
-    return UserService.get_all_users(db)
+    try:
+        users, next_cursor = UserService.get_all_users(db, page_size(limit), cursor, username)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, next_cursor)
+    return users
 
 @router.put("/users/{username}/change-password",response_model=UserResponse)
 def change_password(username: str, user: UserChangePassword, db: Session = Depends(get_db)):
@@ -1,46 +1,62 @@
-from fastapi import APIRouter, UploadFile, File, Depends
+from fastapi import APIRouter, UploadFile, File, Form, Depends
 from fastapi.responses import JSONResponse
-from function.detect import detect_license_plates
+from function.detect import detect_license_plates, motion_gate, result_cache
+from typing import TYPE_CHECKING
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.parking_lot import ParkingLotCreate
-from app.services.parking_lot_service import ParkingLotService
+from app.db.session import get_async_db
+from app.services.gate_event_service import GateEventService
+from app.services.plate_index import plate_index
+from app.core.config import settings
+from app.core.inference import inference_executor, InferenceQueueFull
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/detech-image", tags=["detech-image"])
 
+def queue_full_response():
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Inference queue is full"},
+        headers={"Retry-After": str(settings.INFERENCE_RETRY_AFTER_SECONDS)},
+    )
+
 @router.post("/")
 async def upload_image(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    camera_id: str | None = Form(None),
+    db: "AsyncSession | Session" = Depends(get_async_db)
 ):
     if file.content_type not in ["image/jpeg", "image/png"]:
         return JSONResponse(status_code=400, content={"error": "Invalid image format"})
 
+    # Từ chối sớm trước khi đọc file nếu hàng đợi đã đầy
+    if inference_executor.is_full():
+        return queue_full_response()
+
     image_bytes = await file.read()
-    result = detect_license_plates(image_bytes)
-
-    response_results = []
-    for plate_data in result:
-        plate_data_copy = plate_data.copy()  # Create a copy to avoid modifying original
-        if plate_data.get("valid"):
-            plate = plate_data["plate"]
-            clean_plate = plate.replace("-", "").replace(" ", "")
-            try:
-                # Check if there's an active parking record
-                active_parking = ParkingLotService.get_active_parking_by_plate(db, clean_plate)
-                if active_parking:
-                    # Update exit_time for the record
-                    ParkingLotService.update_exit_time(db, active_parking.id)
-                    plate_data_copy["operation"] = "exit"
-                else:
-                    # Create new entry_time record
-                    parking_data = ParkingLotCreate(license_plate=clean_plate)
-                    ParkingLotService.create_parking_lot(db, parking_data)
-                    plate_data_copy["operation"] = "entry"
-            except ValueError:
-                plate_data_copy["operation"] = "error"
-        else:
-            plate_data_copy["operation"] = "invalid"
-        response_results.append(plate_data_copy)
-
-    return {"results": response_results}
\ No newline at end of file
+    try:
+        # Chạy nhận dạng trong thread pool riêng để không chặn event loop
+        result = await inference_executor.run(detect_license_plates, image_bytes, camera_id)
+    except InferenceQueueFull:
+        return queue_full_response()
+
+    response_results = await GateEventService.process_detection_results_async(db, result, camera_id or "default")
+    return {"results": response_results}
+
+@router.get("/metrics")
+def get_inference_metrics():
+    """
+    Lấy số liệu của hàng đợi nhận dạng ảnh và cache kết quả.
+
+    Returns:
+        dict: Số worker, sức chứa, số tác vụ đang chạy / đang chờ, đã xong, lỗi, bị từ chối,
+            kèm số lần trúng / trượt của cache kết quả, số frame bị bỏ qua theo từng camera
+            và trạng thái chỉ mục biển số đăng ký.
+    """
+    return {
+        **inference_executor.metrics(),
+        "result_cache": result_cache.stats(),
+        "motion_gate": motion_gate.stats(),
+        "plate_index": plate_index.stats(),
+    }
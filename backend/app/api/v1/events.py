@@ -0,0 +1,75 @@
+import asyncio
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import event_broker, format_sse
+from app.models.registered_vehicle import normalize_plate
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+@router.get("/")
+async def stream_events(
+    camera_id: list[str] | None = Query(None),
+    operation: list[str] | None = Query(None),
+    license_plate: str | None = None,
+    company: str | None = None,
+    floor_number: int | None = None,
+    last_event_id: int | None = Query(None),
+    last_event_id_header: int | None = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Nhận sự kiện xe vào / ra theo thời gian thực (Server-Sent Events) thay cho polling.
+
+    Args:
+        camera_id: Chỉ nhận sự kiện của các camera này (lặp lại tham số để chọn nhiều).
+        operation: entry / exit / invalid / error (lặp lại tham số để chọn nhiều).
+        license_plate: Chỉ nhận sự kiện của biển số này.
+        company: Chỉ nhận sự kiện của xe thuộc công ty này.
+        floor_number: Chỉ nhận sự kiện của xe thuộc tầng này.
+        last_event_id: Id sự kiện cuối đã nhận (hoặc header Last-Event-ID khi trình duyệt tự kết nối lại).
+
+    Returns:
+        StreamingResponse: Luồng text/event-stream, mỗi sự kiện có id, event (operation) và data (JSON).
+    """
+    filters = {
+        "camera_id": set(camera_id) if camera_id else None,
+        "operation": set(operation) if operation else None,
+        "license_plate": {normalize_plate(license_plate)} if license_plate else None,
+        "companyName": {company} if company else None,
+        "companyFloor": {floor_number} if floor_number is not None else None,
+    }
+    resume_from = last_event_id if last_event_id is not None else last_event_id_header
+    subscriber, backlog = event_broker.subscribe(filters, resume_from)
+
+    async def event_stream():
+        try:
+            for event in backlog:
+                yield format_sse(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), settings.EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    # Client đọc quá chậm: đóng kết nối, client kết nối lại với Last-Event-ID
+                    break
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/stats")
+def get_event_stats():
+    """
+    Lấy số client đang nghe, số sự kiện đã phát và số client bị ngắt do đọc chậm.
+
+    Returns:
+        dict: clients, published, dropped_clients, history.
+    """
+    return event_broker.stats()
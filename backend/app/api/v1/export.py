@@ -0,0 +1,44 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services.export_service import EXPORT_FORMATS, ExportService
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+@router.get("/parking-lot")
+def export_parking_lot(
+    format: str = "csv",
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    license_plate: str | None = None,
+    company: str | None = None,
+):
+    """
+    Xuất lịch sử gửi xe (kèm thông tin xe) ra file, đọc và ghi theo từng lô.
+
+    Args:
+        format: ndjson | csv | xlsx.
+        start_time, end_time: Lọc theo thời gian vào [start_time, end_time), ví dụ 1 tháng để tính phí.
+        license_plate: Lọc theo biển số.
+        company: Lọc theo công ty.
+
+    Returns:
+        StreamingResponse: Nội dung file, sắp theo thời gian vào.
+
+    Raises:
+        HTTPException: Nếu định dạng không được hỗ trợ (status code 400).
+    """
+    try:
+        chunks = ExportService.export_parking(
+            format, start_time=start_time, end_time=end_time, license_plate=license_plate, company=company
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    media_type, extension = EXPORT_FORMATS[format]
+    suffix = "_".join(value.strftime("%Y%m%d") for value in (start_time, end_time) if value)
+    filename = f"parking_lot{'_' + suffix if suffix else ''}.{extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
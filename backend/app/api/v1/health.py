@@ -0,0 +1,51 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.db.session import ASYNC_DATABASE_URL, engine, get_async_engine, pool_status
+from app.services.plate_index import plate_index
+from function.model_registry import model_registry
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/live")
+def liveness():
+    """
+    Kiểm tra tiến trình API còn hoạt động.
+
+    Returns:
+        dict: Trạng thái "ok".
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+def readiness():
+    """
+    Kiểm tra API đã sẵn sàng nhận ảnh nhận dạng (model đã load và warm-up xong,
+    chỉ mục biển số đăng ký đã được tải).
+
+    Returns:
+        dict: Trạng thái "ready" nếu sẵn sàng, ngược lại trả về status code 503.
+    """
+    if settings.MODEL_WARMUP_ON_STARTUP and not model_registry.is_ready():
+        content = {"status": "warming_up"}
+        if model_registry.warmup_error:
+            content = {"status": "error", "error": model_registry.warmup_error}
+        return JSONResponse(status_code=503, content=content)
+    if not plate_index.loaded:
+        return JSONResponse(status_code=503, content={"status": "loading_plates", "error": plate_index.last_error})
+    return {"status": "ready"}
+
+@router.get("/db-pool")
+def db_pool():
+    """
+    Lấy mức sử dụng connection pool của engine sync và async.
+
+    Returns:
+        dict: Với mỗi engine: loại pool, số kết nối đang mở, đang được dùng, đang rảnh
+            và số kết nối vượt pool_size ("async" là None khi không có driver async).
+    """
+    async_engine = get_async_engine() if ASYNC_DATABASE_URL else None
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.pool) if async_engine is not None else None,
+    }
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from app.schemas.occupancy import OccupancyResponse
+from app.services.occupancy_service import occupancy
+
+router = APIRouter(prefix="/occupancy", tags=["occupancy"])
+
+@router.get("/", response_model=OccupancyResponse)
+def get_occupancy():
+    """
+    Lấy số xe đang trong bãi theo tầng và theo công ty (đọc từ bộ nhớ, không truy vấn database).
+
+    Returns:
+        OccupancyResponse: Tổng số xe, số xe theo từng tầng / công ty và thời điểm đối chiếu gần nhất.
+    """
+    return occupancy.snapshot()
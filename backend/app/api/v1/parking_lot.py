@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from app.core.pagination import page_size, set_next_cursor
 from app.db.session import get_db
 from app.schemas.parking_lot import ParkingLotCreate, ParkingLotResponse
 from app.services.parking_lot_service import ParkingLotService
@@ -40,17 +42,41 @@ def get_vehicles_without_exit_time(db: Session = Depends(get_db)):
     return ParkingLotService.get_vehicles_without_exit_time(db)
 
 @router.get("/", response_model=list[ParkingLotResponse])
-def get_parking_lot(db: Session = Depends(get_db)):
+def get_parking_lot(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    license_plate: str | None = None,
+    company: str | None = None,
+    db: Session = Depends(get_db),
+):
     """
-    Lấy danh sách các phương tiện chưa có thời gian ra.
+    Lấy lịch sử gửi xe theo trang, mới nhất trước.
 
     Args:
+        limit: Số bản ghi mỗi trang (mặc định PAGE_SIZE_DEFAULT, tối đa PAGE_SIZE_MAX).
+        cursor: Giá trị header X-Next-Cursor của trang trước.
+        start_time, end_time: Lọc theo thời gian vào [start_time, end_time).
+        license_plate: Lọc theo biển số.
+        company: Lọc theo công ty.
         db: SQLAlchemy session.
 
     Returns:
-        list[ParkingLotResponse]: Danh sách các bản ghi bãi đỗ chưa có exit_time.
+        list[ParkingLotResponse]: Các bản ghi bãi đỗ; header X-Next-Cursor chứa cursor trang sau nếu còn.
+
+    Raises:
+        HTTPException: Nếu cursor không hợp lệ (status code 400).
     """
-    return ParkingLotService.get_parking_lot(db)
+    try:
+        records, next_cursor = ParkingLotService.list_parking_lot(
+            db, page_size(limit), cursor, start_time, end_time, license_plate, company
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, next_cursor)
+    return records
 
 @router.get("/{id}", response_model=ParkingLotResponse)
 def get_parking_lot(id: int, db: Session = Depends(get_db)):
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
+from typing import TYPE_CHECKING
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.registered_vehicle import VehicleCreate, VehicleResponse
+from app.core.pagination import page_size, set_next_cursor
+from app.db.session import get_async_db, get_db
+from app.schemas.registered_vehicle import VehicleCreate, VehicleImportResponse, VehicleResponse
 from app.services.registered_vehicle_service import VehicleService
+from app.services.vehicle_import_service import VehicleImportService
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(prefix="/registered_vehicle", tags=["registered_vehicle"])
@@ -27,36 +33,68 @@ def create_vehicle(vehicle: VehicleCreate = Depends(VehicleCreate.as_form), imag
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.post("/import_excel")
-async def import_vehicles_excel(file: UploadFile = File(...), db: Session = Depends(get_db)):
+@router.post("/import_excel", response_model=VehicleImportResponse)
+def import_vehicles_excel(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Thêm phương tiện hàng loạt từ file Excel.
+
+    Args:
+        file: File Excel, mỗi dòng gồm license_plate, owner_name, phone_number, company, floor_number, image_path.
+        db: SQLAlchemy session.
+
+    Returns:
+        VehicleImportResponse: Số phương tiện đã thêm / bỏ qua / lỗi kèm lỗi theo từng dòng.
+
+    Raises:
+        HTTPException: Nếu file không phải Excel hợp lệ (status code 400).
+    """
     try:
-        contents = await file.read()
-        return VehicleService.import_vehicles_excel(contents, db)
+        # File upload đã nằm trên đĩa / bộ nhớ tạm, đọc trực tiếp thay vì nạp toàn bộ vào bytes
+        return VehicleImportService.import_excel(file.file, db)
     except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/vehicles", response_model=list[VehicleResponse])
-def get_all_vehicles(db: Session = Depends(get_db)):
+def get_all_vehicles(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    license_plate: str | None = None,
+    company: str | None = None,
+    db: Session = Depends(get_db),
+):
     """
-    Lấy tất cả thông tin phương tiện.
+    Lấy thông tin phương tiện đã đăng ký theo trang, sắp theo biển số.
 
     Args:
+        limit: Số phương tiện mỗi trang (mặc định PAGE_SIZE_DEFAULT, tối đa PAGE_SIZE_MAX).
+        cursor: Giá trị header X-Next-Cursor của trang trước.
+        license_plate: Lọc theo phần đầu biển số.
+        company: Lọc theo công ty.
         db: SQLAlchemy session.
 
     Returns:
-        list[VehicleResponse]: Danh sách thông tin tất cả xe đã đăng ký.
+        list[VehicleResponse]: Danh sách xe đã đăng ký; header X-Next-Cursor chứa cursor trang sau nếu còn.
+
+    Raises:
+        HTTPException: Nếu cursor không hợp lệ (status code 400).
     """
-    return VehicleService.get_all_vehicles(db)
+    try:
+        vehicles, next_cursor = VehicleService.get_all_vehicles(db, page_size(limit), cursor, license_plate, company)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, next_cursor)
+    return vehicles
 
 @router.get("/{license_plate}", response_model=VehicleResponse)
-def get_vehicle(license_plate: str, db: Session = Depends(get_db)):
+async def get_vehicle(license_plate: str, db: "AsyncSession | Session" = Depends(get_async_db)):
     """
     Lấy thông tin phương tiện theo biển số.
 
     Args:
         license_plate: Biển số phương tiện.
-        db: SQLAlchemy session.
+        db: SQLAlchemy AsyncSession (hoặc Session khi không có driver async).
 
     Returns:
         VehicleResponse: Thông tin phương tiện.
@@ -66,7 +104,7 @@ def get_vehicle(license_plate: str, db: Session = Depends(get_db)):
     """
     try:
         
-        return VehicleService.get_vehicle_by_license_plate(db, license_plate)
+        return await VehicleService.get_vehicle_by_license_plate_async(db, license_plate)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, HTTPException
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.stream import StreamCreate, StreamStatus
+from app.services.gate_event_service import GateEventService
+from function.detect import detect_stream_frame, motion_gate
+from function.stream import stream_manager
+from function.tracker import PlateTracker
+
+router = APIRouter(prefix="/streams", tags=["streams"])
+
+def record_stream_results(camera_id: str, results: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        GateEventService.process_detection_results(db, results, camera_id)
+    finally:
+        db.close()
+
+@router.post("/", response_model=StreamStatus)
+def start_stream(stream: StreamCreate):
+    """
+    Bắt đầu nhận dạng biển số trực tiếp từ video của camera.
+
+    Args:
+        stream: Schema chứa camera_id và nguồn video (file hoặc URL RTSP).
+
+    Returns:
+        StreamStatus: Trạng thái stream vừa tạo.
+
+    Raises:
+        HTTPException: Nếu camera đang có stream chạy (status code 400).
+    """
+    tracker = None
+    if settings.STREAM_TRACKER_ENABLED:
+        tracker = PlateTracker(
+            iou_threshold=settings.STREAM_TRACK_IOU,
+            max_missed=settings.STREAM_TRACK_MAX_MISSED,
+            confirm_votes=settings.STREAM_TRACK_CONFIRM_VOTES,
+            max_ocr_per_track=settings.STREAM_TRACK_MAX_OCR,
+        )
+    try:
+        video_stream = stream_manager.start_stream(
+            stream.camera_id,
+            stream.source,
+            detect_stream_frame,
+            record_stream_results,
+            target_fps=settings.STREAM_TARGET_FPS,
+            idle_fps=settings.STREAM_IDLE_FPS,
+            plate_cooldown=settings.STREAM_PLATE_COOLDOWN_SECONDS,
+            reconnect_delay=settings.STREAM_RECONNECT_SECONDS,
+            tracker=tracker,
+        )
+        return video_stream.status()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/", response_model=list[StreamStatus])
+def list_streams():
+    """
+    Lấy trạng thái tất cả các stream.
+
+    Returns:
+        list[StreamStatus]: Số frame đã đọc / xử lý / bỏ qua, tốc độ lấy mẫu, lỗi gần nhất.
+    """
+    return stream_manager.list_streams()
+
+@router.delete("/{camera_id}")
+def stop_stream(camera_id: str):
+    """
+    Dừng stream của camera.
+
+    Args:
+        camera_id: Mã camera.
+
+    Returns:
+        dict: Thông báo dừng thành công.
+
+    Raises:
+        HTTPException: Nếu camera không có stream (status code 404).
+    """
+    try:
+        stream_manager.stop_stream(camera_id)
+        motion_gate.reset(camera_id)
+        return {"message": "Stream stopped successfully"}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -10,5 +10,86 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Connection pool (dùng chung cho engine sync và async, bỏ qua với SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30  # Số giây chờ kết nối rảnh trước khi báo lỗi
+    DB_POOL_RECYCLE: int = 1800  # Đóng và mở lại kết nối sau số giây này
+    DB_ASYNC_ENABLED: bool = True  # Dùng asyncpg / aiosqlite cho các route async nếu đã cài driver
+
+    # Nhận dạng biển số
+    OCR_BATCH_MODE: bool = True  # Gộp tất cả ảnh biển số + biến thể deskew vào 1 lần chạy OCR
+    OCR_CONFIDENCE_THRESHOLD: float = 0.85  # Dừng thử biến thể deskew khi đạt độ tin cậy này
+    OCR_MAX_VARIANTS: int = 4  # Số biến thể deskew tối đa cho mỗi biển số (1-4)
+    OCR_VARIANTS_PER_PASS: int = 4  # Số biến thể OCR trong mỗi lượt (4 = tất cả trong 1 lượt, 1 = dừng sớm từng biến thể)
+    PLATE_RECTIFY_MODE: str = "deskew"  # deskew (thử 2x2 biến thể) | perspective (nắn phẳng 1 lần)
+    DETECT_REDUCED_DECODE: bool = True  # Giải mã ảnh upload ở độ phân giải thấp hơn cho bước phát hiện
+    DETECT_DECODE_MIN_SIDE: int = 1280  # Cạnh dài tối thiểu của ảnh giải mã thu nhỏ
+
+    # Cache kết quả cho frame trùng / gần giống nhau theo từng camera
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 256
+    RESULT_CACHE_TTL_SECONDS: float = 10
+    RESULT_CACHE_MAX_HAMMING: int = 4  # Số bit khác nhau tối đa (trên 64) giữa 2 hash cảm nhận
+
+    # Chỉ mục biển số đăng ký trong bộ nhớ (làm mới từ nhật ký thay đổi giữa các worker)
+    PLATE_INDEX_REFRESH_SECONDS: float = 5
+    PLATE_INDEX_FULL_RELOAD_SECONDS: float = 3600
+    PLATE_INDEX_CHANGE_RETENTION_HOURS: float = 24  # Phải lớn hơn nhiều so với chu kỳ tải lại toàn bộ
+    PLATE_INDEX_LOOKBACK_SECONDS: float = 60  # Đọc lại nhật ký trong khoảng này để bắt thay đổi commit trễ
+
+    # Khớp gần đúng biển số đọc sai ký tự dễ nhầm (0/O/D, 8/B, 1/I, 5/S...)
+    PLATE_FUZZY_MATCH_ENABLED: bool = True
+    PLATE_MATCH_MAX_DISTANCE: int = 2  # Nhầm ký tự tốn 1, đổi / thêm / xoá ký tự khác tốn 3 (tối đa 5)
+
+    # Ghi nhận xe vào / ra ở cổng
+    GATE_DEDUP_SECONDS: float = 10  # Lượt gửi mở / đóng trong khoảng này được coi là cùng 1 lần qua cổng
+
+    OCCUPANCY_RECONCILE_SECONDS: float = 60  # Chu kỳ đối chiếu số xe trong bãi với database
+
+    # Bỏ qua frame tĩnh / làn trống trước khi chạy model
+    MOTION_GATE_ENABLED: bool = True
+    MOTION_GATE_ALPHA: float = 0.05  # Tốc độ cập nhật ảnh nền
+    MOTION_PIXEL_THRESHOLD: int = 25  # Độ lệch xám tối thiểu để tính là điểm ảnh thay đổi
+    MOTION_MIN_ACTIVITY: float = 0.01  # Tỉ lệ điểm ảnh thay đổi tối thiểu để chạy nhận dạng
+    MOTION_MAX_SKIP_SECONDS: float = 10  # Vẫn xử lý 1 frame sau mỗi khoảng này dù frame tĩnh
+
+    # Camera được OCR cả ảnh khi không phát hiện được biển số (ví dụ camera chụp sát biển số)
+    FULL_FRAME_OCR_CAMERAS: list[str] = []
+
+    # Phân trang các API danh sách (parking-lot, registered_vehicle, users)
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+
+    # Luồng sự kiện xe vào / ra (Server-Sent Events, /events)
+    EVENT_HISTORY_SIZE: int = 1000  # Số sự kiện gần nhất giữ lại cho client kết nối lại
+    EVENT_CLIENT_BUFFER_SIZE: int = 100  # Client chậm hơn mức này bị ngắt kết nối
+    EVENT_HEARTBEAT_SECONDS: float = 15
+
+    # Thread pool nhận dạng ảnh (chạy ngoài event loop)
+    INFERENCE_MAX_WORKERS: int = 2
+    INFERENCE_QUEUE_SIZE: int = 8  # Số request được phép chờ thêm khi tất cả worker đang bận
+    INFERENCE_RETRY_AFTER_SECONDS: int = 1
+
+    MODEL_WARMUP_ON_STARTUP: bool = True  # Tắt cho worker chỉ phục vụ CRUD
+    INFERENCE_BACKEND: str = "pytorch"  # pytorch | torchscript | onnx (xem function/backends.py)
+    OCR_QUANTIZATION: str = "none"  # none | int8 (ONNX Runtime, xem function/quantize.py)
+
+    # Gom ảnh từ nhiều request đồng thời thành 1 batch (micro-batching)
+    DETECT_MAX_BATCH_SIZE: int = 8
+    DETECT_MAX_WAIT_MS: float = 5
+    OCR_MAX_BATCH_SIZE: int = 32
+    OCR_MAX_WAIT_MS: float = 2
+
+    # Nhận dạng trực tiếp từ video stream (file hoặc RTSP)
+    STREAM_TARGET_FPS: float = 5  # Tốc độ lấy mẫu khi đang có xe
+    STREAM_IDLE_FPS: float = 1  # Tốc độ lấy mẫu tối thiểu khi làn trống
+    STREAM_PLATE_COOLDOWN_SECONDS: float = 30  # Không ghi nhận lại cùng biển số trong khoảng này
+    STREAM_RECONNECT_SECONDS: float = 5
+    STREAM_TRACKER_ENABLED: bool = True  # Theo dõi biển số qua các frame, chỉ OCR track mới / chưa ổn định
+    STREAM_TRACK_IOU: float = 0.3
+    STREAM_TRACK_MAX_MISSED: int = 10  # Số frame mất dấu trước khi coi xe đã rời khung hình
+    STREAM_TRACK_CONFIRM_VOTES: float = 3  # Tổng độ tin cậy cần để xác nhận 1 biển số
+    STREAM_TRACK_MAX_OCR: int = 10
 
 settings = Settings()
\ No newline at end of file
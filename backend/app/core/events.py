@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from app.core.config import settings
+
+
+class Subscriber:
+    def __init__(self, loop, buffer_size: int, filters: dict):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.filters = filters
+        self.dropped = False
+
+    def matches(self, event: dict) -> bool:
+        return all(value is None or event.get(key) in value for key, value in self.filters.items())
+
+
+class EventBroker:
+    """
+    Phát sự kiện xe vào / ra tới các client đang nghe (Server-Sent Events).
+
+    Mỗi client có hàng đợi giới hạn buffer_size; client đọc chậm làm đầy hàng đợi
+    sẽ bị ngắt kết nối thay vì làm chậm các client khác, và có thể kết nối lại với
+    Last-Event-ID để nhận tiếp các sự kiện còn trong history_size sự kiện gần nhất.
+    Sự kiện chỉ gồm các lượt do worker hiện tại xử lý.
+    """
+
+    def __init__(self, history_size: int, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        # Id tăng dần theo thời gian khởi động để không lặp lại sau khi restart
+        self._ids = itertools.count(time.time_ns() // 1_000_000)
+        self.published = 0
+        self.dropped_clients = 0
+
+    def publish(self, event: dict) -> dict:
+        """
+        Gửi sự kiện tới các client, gọi được từ bất kỳ thread nào.
+
+        Returns:
+            dict: Sự kiện đã được gán id và timestamp
+        """
+        with self._lock:
+            event = {"id": next(self._ids), "timestamp": datetime.now(timezone.utc).isoformat(), **event}
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscriber in subscribers:
+            if subscriber.matches(event):
+                try:
+                    subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, event)
+                except RuntimeError:
+                    # Event loop của client đã đóng
+                    self.unsubscribe(subscriber)
+        return event
+
+    def _deliver(self, subscriber: Subscriber, event: dict) -> None:
+        if subscriber.dropped:
+            return
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client quá chậm: xoá hàng đợi và báo ngắt kết nối
+            subscriber.dropped = True
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(None)
+            self.unsubscribe(subscriber)
+            with self._lock:
+                self.dropped_clients += 1
+
+    def subscribe(self, filters: dict, last_event_id: int | None = None) -> tuple[Subscriber, list[dict]]:
+        """
+        Đăng ký client mới; gọi trong event loop của request.
+
+        Args:
+            filters: Tên trường -> tập giá trị chấp nhận (None = không lọc)
+            last_event_id: Id sự kiện cuối client đã nhận, để gửi lại các sự kiện bị lỡ
+
+        Returns:
+            tuple[Subscriber, list[dict]]: Client và các sự kiện cần gửi lại
+        """
+        subscriber = Subscriber(asyncio.get_running_loop(), self.buffer_size, filters)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            history = list(self._history)
+        backlog = []
+        if last_event_id is not None and history:
+            # Id không nằm trong lịch sử (ví dụ server đã restart): gửi lại toàn bộ lịch sử
+            if history[0]["id"] - 1 <= last_event_id <= history[-1]["id"]:
+                history = [event for event in history if event["id"] > last_event_id]
+            backlog = [event for event in history if subscriber.matches(event)]
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clients": len(self._subscribers),
+                "published": self.published,
+                "dropped_clients": self.dropped_clients,
+                "history": len(self._history),
+            }
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['operation']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+event_broker = EventBroker(settings.EVENT_HISTORY_SIZE, settings.EVENT_CLIENT_BUFFER_SIZE)
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+
+
+class InferenceQueueFull(Exception):
+    pass
+
+
+class InferenceExecutor:
+    """
+    Thread pool riêng cho các tác vụ nhận dạng (CPU-heavy) để không chặn event loop.
+
+    Số tác vụ đang chờ + đang chạy bị giới hạn bởi max_workers + max_queue_size;
+    khi vượt quá, submit() ném InferenceQueueFull để API trả về 503 ngay lập tức.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue_size
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return self._pending >= self.capacity
+
+    def submit(self, fn, *args):
+        """
+        Đưa một tác vụ vào hàng đợi.
+
+        Returns:
+            concurrent.futures.Future: Kết quả của fn(*args)
+
+        Raises:
+            InferenceQueueFull: Nếu hàng đợi đã đầy
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise InferenceQueueFull("Inference queue is full")
+            self._pending += 1
+        future = self._executor.submit(self._call, fn, args)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _call(self, fn, args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "capacity": self.capacity,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = InferenceExecutor(settings.INFERENCE_MAX_WORKERS, settings.INFERENCE_QUEUE_SIZE)
@@ -0,0 +1,73 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import Response
+from app.core.config import settings
+
+# Phân trang keyset: cursor là giá trị khoá sắp xếp của dòng cuối trang trước,
+# mã hoá base64 để client chỉ việc gửi lại nguyên vẹn. Trang tiếp theo được trả về
+# qua header X-Next-Cursor, body vẫn là danh sách như trước. Mọi request đều được giới hạn
+# (mặc định PAGE_SIZE_DEFAULT, tối đa PAGE_SIZE_MAX); client cần toàn bộ danh sách thì đọc
+# lần lượt các trang theo X-Next-Cursor.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    """
+    Giải mã cursor do encode_cursor tạo ra.
+
+    Args:
+        cursor: Cursor client gửi lên
+        types: Kiểu của từng giá trị trong cursor (datetime được mã hoá thành chuỗi ISO)
+
+    Raises:
+        ValueError: Nếu cursor không hợp lệ
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    decoded = []
+    for value, expected in zip(values, types):
+        # bool là lớp con của int trong Python nên phải loại riêng
+        if isinstance(value, bool):
+            raise ValueError("Invalid cursor")
+        if expected is datetime and isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+        if not isinstance(value, expected):
+            raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def page_size(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return settings.PAGE_SIZE_DEFAULT
+    return min(limit, settings.PAGE_SIZE_MAX)
+
+
+def fetch_limit(limit: int | None) -> int | None:
+    # Truy vấn thêm 1 dòng để biết còn trang sau hay không
+    return None if limit is None else limit + 1
+
+
+def split_page(rows: list, limit: int | None, cursor_of) -> tuple[list, str | None]:
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*cursor_of(rows[-1]))
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,121 @@
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert, text
+from app.db.session import Base
+from app.db.init_db import migrate_db
+from app.models.parking_lot import ParkingLot
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
+
+# So sánh query plan và thời gian của các truy vấn thường dùng trước / sau khi tạo index,
+# trên 1 database riêng với 1 triệu lượt gửi xe.
+# CẢNH BÁO: script xoá và tạo lại toàn bộ bảng trong database được truyền vào.
+# Chạy: python -m app.db.benchmark_indexes [DATABASE_URL]   (mặc định sqlite:///benchmark_indexes.db)
+VEHICLES = 20_000
+SESSIONS = 1_000_000
+OPEN_RATIO = 0.3
+REPEATS = 5
+
+QUERIES = {
+    "Lượt gửi đang mở theo biển số": (
+        "SELECT id FROM parking_lot WHERE license_plate = :plate AND exit_time IS NULL", True),
+    "Xe chưa ra, mới nhất trước": (
+        "SELECT id, license_plate, entry_time FROM parking_lot WHERE exit_time IS NULL ORDER BY entry_time DESC", False),
+    "100 lượt gửi mới nhất": (
+        "SELECT id, license_plate, entry_time FROM parking_lot ORDER BY entry_time DESC LIMIT 100", False),
+    "Lịch sử gửi của 1 xe": (
+        "SELECT id, entry_time FROM parking_lot WHERE license_plate = :plate ORDER BY entry_time DESC", True),
+    "Xe đăng ký theo biển số chuẩn hoá": (
+        "SELECT license_plate FROM registered_vehicles WHERE normalized_plate = :normalized", True),
+}
+
+
+def plate_of(i: int) -> str:
+    return f"{10 + i % 90}A{i:05d}"
+
+
+def populate(engine) -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Trạng thái "trước": chỉ còn khoá chính
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(bind=conn, checkfirst=True)
+
+    per_vehicle = SESSIONS // VEHICLES
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(RegisteredVehicle), [
+            {"license_plate": plate_of(i), "normalized_plate": normalize_plate(plate_of(i)),
+             "owner_name": f"Owner {i}", "phone_number": "0900000000"}
+            for i in range(VEHICLES)
+        ])
+        batch = []
+        for k in range(per_vehicle):
+            for i in range(VEHICLES):
+                is_last = k == per_vehicle - 1
+                entry_time = start + timedelta(seconds=30 * (k * VEHICLES + i))
+                open_session = is_last and i < VEHICLES * OPEN_RATIO
+                batch.append({
+                    "license_plate": plate_of(i),
+                    "entry_time": entry_time,
+                    "exit_time": None if open_session else entry_time + timedelta(hours=2),
+                })
+                if len(batch) == 50_000:
+                    conn.execute(insert(ParkingLot), batch)
+                    batch = []
+        if batch:
+            conn.execute(insert(ParkingLot), batch)
+    # Biển số được tra cứu: xe cuối cùng, nằm cuối bảng
+    return plate_of(VEHICLES - 1)
+
+
+def explain(conn, sql: str, params: dict) -> str:
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = conn.execute(text("EXPLAIN " + sql), params).scalars().all()
+    return "; ".join(row.strip() for row in rows)
+
+
+def measure(engine, plate: str) -> dict:
+    params = {"plate": plate, "normalized": normalize_plate(plate)}
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        for name, (sql, uses_params) in QUERIES.items():
+            query_params = params if uses_params else {}
+            timings = []
+            for _ in range(REPEATS):
+                started = time.perf_counter()
+                conn.execute(text(sql), query_params).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = (explain(conn, sql, query_params), statistics.median(timings))
+    return results
+
+
+def run_benchmark(url: str) -> str:
+    engine = create_engine(url)
+    print(f"Populating {SESSIONS} parking sessions for {VEHICLES} vehicles...")
+    plate = populate(engine)
+    before = measure(engine, plate)
+    migrate_db(engine)
+    after = measure(engine, plate)
+
+    lines = [
+        f"Database: {engine.dialect.name}, {SESSIONS} parking sessions, {VEHICLES} vehicles, median of {REPEATS} runs",
+        "",
+        "| Query | Before (ms) | After (ms) | Plan before | Plan after |",
+        "|---|---|---|---|---|",
+    ]
+    for name in QUERIES:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        lines.append(f"| {name} | {ms_before:.2f} | {ms_after:.2f} | {plan_before} | {plan_after} |")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(run_benchmark(sys.argv[1] if len(sys.argv) > 1 else "sqlite:///benchmark_indexes.db"))
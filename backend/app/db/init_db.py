@@ -1,10 +1,39 @@
+from sqlalchemy import inspect, text
 from app.db.session import engine, Base
-from app.models import user, registered_vehicle,parking_lot  # Import tất cả các model
+from app.models import user, registered_vehicle,parking_lot, registered_vehicle_change  # Import tất cả các model
+from app.models.registered_vehicle import normalize_plate
 
 def init_db():
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     print("Database tables created.")
+    migrate_db()
+
+def migrate_db(bind=engine):
+    # create_all không sửa bảng đã có: thêm cột normalized_plate và các index còn thiếu
+    with bind.begin() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("registered_vehicles")}
+        if "normalized_plate" not in columns:
+            conn.execute(text("ALTER TABLE registered_vehicles ADD COLUMN normalized_plate VARCHAR"))
+        rows = conn.execute(text(
+            "SELECT license_plate FROM registered_vehicles WHERE normalized_plate IS NULL"
+        )).scalars().all()
+        if rows:
+            conn.execute(
+                text("UPDATE registered_vehicles SET normalized_plate = :normalized WHERE license_plate = :plate"),
+                [{"normalized": normalize_plate(plate), "plate": plate} for plate in rows],
+            )
+
+        # Đóng các lượt gửi chưa ra bị trùng (chỉ giữ lượt mới nhất) trước khi tạo unique index
+        conn.execute(text(
+            "UPDATE parking_lot SET exit_time = entry_time "
+            "WHERE exit_time IS NULL AND id NOT IN "
+            "(SELECT MAX(id) FROM parking_lot WHERE exit_time IS NULL GROUP BY license_plate)"
+        ))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+    print("Database migrated.")
 
 # Chạy lệnh tạo database (chỉ chạy lần đầu)
 if __name__ == "__main__":
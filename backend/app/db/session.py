@@ -1,15 +1,115 @@
 # app/db/session.py
+import importlib.util
+from typing import TYPE_CHECKING
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio cần greenlet ngay khi import (SQLAlchemy 2.1) nên chỉ import khi dùng
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Driver async tương ứng với driver sync trong DATABASE_URL
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+# Tham số libpq / psycopg2 trong query string -> tham số tương ứng của asyncpg
+ASYNCPG_QUERY_ARGS = {"sslmode": "ssl", "connect_timeout": "timeout"}
+
+def pool_options(url: str) -> dict:
+    # SQLite (database local / test) giữ pool mặc định của SQLAlchemy
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+def async_url(url: str) -> str | None:
+    """
+    Đổi DATABASE_URL sang driver async tương ứng.
+
+    Returns:
+        str | None: URL async, None nếu database không có driver async hoặc driver chưa được cài
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or importlib.util.find_spec(driver) is None or importlib.util.find_spec("greenlet") is None:
+        return None
+    query = dict(parsed.query)
+    if driver == "asyncpg":
+        query = {ASYNCPG_QUERY_ARGS.get(key, key): value for key, value in query.items()}
+    return parsed.set(drivername=f"{backend}+{driver}", query=query).render_as_string(hide_password=False)
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, **pool_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Engine async cho các route chạy trên event loop (asyncpg / aiosqlite), chỉ được tạo khi
+# có request đầu tiên cần tới. Không có driver async thì các route đó dùng session sync
+# chạy trong thread pool.
+ASYNC_DATABASE_URL = async_url(settings.DATABASE_URL) if settings.DB_ASYNC_ENABLED else None
+_async_engine = None
+_async_session_factory = None
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None and ASYNC_DATABASE_URL:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, **pool_options(settings.DATABASE_URL))
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def dispose_async_engine() -> None:
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    # AsyncSession nếu có driver async, ngược lại là Session sync (xem run_in_session)
+    if get_async_engine() is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+    async with _async_session_factory() as db:
+        yield db
+
+async def run_in_session(db: "AsyncSession | Session", fn, *args, **kwargs):
+    """
+    Chạy hàm service sync fn(session, *args, **kwargs) mà không chặn event loop.
+
+    Với AsyncSession, fn chạy qua run_sync trên kết nối async; với Session sync
+    (không có driver async), fn chạy trong thread pool.
+
+    run_sync vẫn chạy code ORM (dựng object, from_orm...) trên thread của event loop nên
+    chỉ dùng cho các truy vấn ngắn như bật / tắt lượt gửi xe ở cổng hay tra 1 biển số;
+    route trả về danh sách dùng route sync với get_db.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
+
+def pool_status(pool) -> dict:
+    # Số kết nối của pool; NullPool / StaticPool không đếm kết nối nên chỉ có tên loại pool
+    status = {"pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+        })
+    return status
@@ -1,6 +1,13 @@
 from fastapi import FastAPI
-from app.api.v1 import auth, registered_vehicle, parking_lot,detech_image
+from app.api.v1 import auth, registered_vehicle, parking_lot,detech_image, health, stream, export, events, occupancy as occupancy_api
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.inference import inference_executor
+from app.db.session import dispose_async_engine as dispose_async_db_engine
+from app.services.occupancy_service import occupancy
+from app.services.plate_index import plate_index
+from function.model_registry import model_registry
+from function.stream import stream_manager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
@@ -13,6 +20,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Cursor trang tiếp theo của các API danh sách
 )
 
 # Gắn các router API vào app
@@ -20,8 +28,33 @@ app.include_router(detech_image.router)
 app.include_router(auth.router)
 app.include_router(registered_vehicle.router)
 app.include_router(parking_lot.router)
+app.include_router(health.router)
+app.include_router(stream.router)
+app.include_router(export.router)
+app.include_router(occupancy_api.router)
+app.include_router(events.router)
 # app.include_router(detection.router, prefix="/api/v1/detection", tags=["detection"])
 
+@app.on_event("startup")
+def warm_up_models():
+    # Warm-up chạy nền, /health/ready trả về 503 cho tới khi xong
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        model_registry.start_warm_up()
+    # Tải chỉ mục biển số đăng ký (chặn tới khi xong) rồi làm mới định kỳ ở thread nền
+    plate_index.start()
+    occupancy.start()
+
+@app.on_event("shutdown")
+def shutdown_inference_executor():
+    stream_manager.stop_all()
+    inference_executor.shutdown()
+    plate_index.stop()
+    occupancy.stop()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await dispose_async_db_engine()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Parking Management API"}
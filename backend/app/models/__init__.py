@@ -1,2 +1,3 @@
 from .registered_vehicle import RegisteredVehicle
-from .parking_lot import ParkingLot
\ No newline at end of file
+from .parking_lot import ParkingLot
+from .registered_vehicle_change import RegisteredVehicleChange
\ No newline at end of file
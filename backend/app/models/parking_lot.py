@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from datetime import datetime
 
+# Dialect hỗ trợ partial index (CREATE INDEX ... WHERE). Dialect khác sẽ bỏ mất điều kiện
+# WHERE và tạo index trên toàn bảng (unique trên toàn bộ lịch sử thì xe không thể gửi lại)
+# nên các partial index chỉ được tạo trên các dialect này.
+PARTIAL_INDEX_DIALECTS = ("postgresql", "sqlite")
+
 class ParkingLot(Base):
     __tablename__ = "parking_lot"
 
@@ -13,5 +18,28 @@ class ParkingLot(Base):
 
     registered_vehicles = relationship("RegisteredVehicle", back_populates="parking_lot")
 
+    __table_args__ = (
+        # Mỗi xe chỉ có tối đa 1 lượt gửi chưa ra, kể cả khi 2 camera cùng ghi nhận 1 lúc.
+        # Cũng là index cho tra cứu lượt gửi đang mở theo biển số.
+        Index(
+            "uq_parking_lot_open_session",
+            "license_plate",
+            unique=True,
+            postgresql_where=exit_time.is_(None),
+            sqlite_where=exit_time.is_(None),
+        ).ddl_if(dialect=PARTIAL_INDEX_DIALECTS),
+        # Lịch sử gửi xe theo biển số (xoá / lọc theo xe, cascade khi xoá xe)
+        Index("ix_parking_lot_plate_entry_time", "license_plate", "entry_time"),
+        # Danh sách mới nhất trước
+        Index("ix_parking_lot_entry_time", "entry_time"),
+        # Danh sách xe chưa ra, mới nhất trước
+        Index(
+            "ix_parking_lot_open_entry_time",
+            "entry_time",
+            postgresql_where=exit_time.is_(None),
+            sqlite_where=exit_time.is_(None),
+        ).ddl_if(dialect=PARTIAL_INDEX_DIALECTS),
+    )
+
     def __repr__(self):
         return f"<Parking {self.license_plate}>"
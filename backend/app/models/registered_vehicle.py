@@ -1,11 +1,17 @@
+import re
 from sqlalchemy import Column, String, Text, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.db.session import Base
 
+def normalize_plate(license_plate: str) -> str:
+    # Chỉ giữ chữ và số, viết hoa: "29a-123.45" -> "29A12345"
+    return re.sub(r'[^a-zA-Z0-9]', '', license_plate or "").upper()
+
 class RegisteredVehicle(Base):
     __tablename__ = "registered_vehicles"
 
     license_plate = Column(String, primary_key=True)
+    normalized_plate = Column(String, nullable=True, index=True)  # Được gán tự động từ license_plate
     owner_name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)
     company = Column(String, nullable=True)
@@ -14,5 +20,10 @@ class RegisteredVehicle(Base):
 
     parking_lot = relationship("ParkingLot", back_populates="registered_vehicles", cascade="all, delete")
 
+    @validates("license_plate")
+    def set_normalized_plate(self, key, license_plate):
+        self.normalized_plate = normalize_plate(license_plate)
+        return license_plate
+
     def __repr__(self):
         return f"<Vehicle {self.license_plate}>"
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.session import Base
+from datetime import datetime
+
+class RegisteredVehicleChange(Base):
+    # Nhật ký thay đổi xe đăng ký, các worker đọc để làm mới chỉ mục biển số trong bộ nhớ
+    __tablename__ = "registered_vehicle_changes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    license_plate = Column(String, nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<VehicleChange {self.id} {self.license_plate}>"
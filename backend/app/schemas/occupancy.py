@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class FloorOccupancy(BaseModel):
+    floor_number: Optional[int] = None
+    count: int
+
+class CompanyOccupancy(BaseModel):
+    company: Optional[str] = None
+    count: int
+
+class OccupancyResponse(BaseModel):
+    total: int
+    floors: list[FloorOccupancy]
+    companies: list[CompanyOccupancy]
+    reconciled_at: Optional[datetime] = None
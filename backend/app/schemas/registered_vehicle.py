@@ -83,4 +83,16 @@ class VehicleResponse(VehicleBase):
     class Config:
         from_attributes = True
 
-  
\ No newline at end of file
+class VehicleImportError(BaseModel):
+    row: int
+    license_plate: Optional[str] = None
+    error: str
+
+class VehicleImportResponse(BaseModel):
+    status: str  # success | partial | error
+    message: str
+    total_rows: int
+    inserted: int
+    skipped: int  # Đã tồn tại trong database
+    failed: int
+    errors: list[VehicleImportError]  # Tối đa MAX_REPORTED_ERRORS dòng đầu tiên
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Annotated, Optional
+from pydantic.types import StringConstraints
+
+class StreamCreate(BaseModel):
+    camera_id: Annotated[str, StringConstraints(min_length=1, max_length=50)]
+    source: Annotated[str, StringConstraints(min_length=1)]  # Đường dẫn file video hoặc URL RTSP
+
+class StreamStatus(BaseModel):
+    camera_id: str
+    source: str
+    running: bool
+    finished: bool
+    frames_read: int
+    frames_processed: int
+    frames_dropped: int
+    sampling_fps: float
+    processing_ms: float
+    active_tracks: int
+    last_error: Optional[str] = None
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+from openpyxl import Workbook
+from sqlalchemy import select
+from app.db.session import SessionLocal
+from app.models.parking_lot import ParkingLot
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
+
+EXPORT_COLUMNS = (
+    "id", "license_plate", "owner_name", "phone_number", "company", "floor_number", "entry_time", "exit_time",
+)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+FETCH_SIZE = 1000
+CHUNK_ROWS = 500  # Số dòng NDJSON / CSV gộp thành 1 chunk gửi đi
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ExportService:
+    @staticmethod
+    def iter_parking_rows(start_time: datetime | None = None, end_time: datetime | None = None,
+                          license_plate: str | None = None, company: str | None = None):
+        """
+        Đọc lịch sử gửi xe kèm thông tin xe theo từng lô bằng server-side cursor.
+
+        Generator tự mở và đóng session riêng vì được chạy sau khi request handler đã trả về.
+
+        Yields:
+            tuple: Giá trị theo thứ tự EXPORT_COLUMNS, sắp theo thời gian vào
+        """
+        statement = (
+            select(
+                ParkingLot.id, ParkingLot.license_plate, RegisteredVehicle.owner_name,
+                RegisteredVehicle.phone_number, RegisteredVehicle.company, RegisteredVehicle.floor_number,
+                ParkingLot.entry_time, ParkingLot.exit_time,
+            )
+            .join(RegisteredVehicle, ParkingLot.license_plate == RegisteredVehicle.license_plate)
+            .order_by(ParkingLot.entry_time, ParkingLot.id)
+            .execution_options(stream_results=True, yield_per=FETCH_SIZE)
+        )
+        if start_time:
+            statement = statement.where(ParkingLot.entry_time >= start_time)
+        if end_time:
+            statement = statement.where(ParkingLot.entry_time < end_time)
+        if license_plate:
+            statement = statement.where(RegisteredVehicle.normalized_plate == normalize_plate(license_plate))
+        if company:
+            statement = statement.where(RegisteredVehicle.company == company)
+
+        db = SessionLocal()
+        try:
+            for row in db.execute(statement):
+                yield tuple(row)
+        finally:
+            db.close()
+
+    @staticmethod
+    def to_ndjson(rows):
+        lines = []
+        for row in rows:
+            record = {
+                column: value.isoformat() if isinstance(value, datetime) else value
+                for column, value in zip(EXPORT_COLUMNS, row)
+            }
+            lines.append(json.dumps(record, ensure_ascii=False))
+            if len(lines) == CHUNK_ROWS:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    @staticmethod
+    def to_csv(rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write("\ufeff")  # BOM để Excel đọc đúng tiếng Việt
+        writer.writerow(EXPORT_COLUMNS)
+        count = 0
+        for row in rows:
+            writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+            count += 1
+            if count % CHUNK_ROWS == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def to_xlsx(rows):
+        # File XLSX là file zip nên phải ghi xong mới gửi được: ghi ra file tạm ở chế độ
+        # write-only (không giữ các dòng trong bộ nhớ) rồi gửi file theo từng chunk
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("parking_lot")
+            sheet.append(EXPORT_COLUMNS)
+            for row in rows:
+                sheet.append(row)
+            workbook.save(path)
+            with open(path, "rb") as f:
+                while chunk := f.read(FILE_CHUNK_SIZE):
+                    yield chunk
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def export_parking(export_format: str, **filters):
+        """
+        Tạo nội dung file export lịch sử gửi xe theo từng chunk.
+
+        Args:
+            export_format: ndjson | csv | xlsx
+            filters: start_time, end_time, license_plate, company
+
+        Returns:
+            Iterator[bytes]: Các chunk của file
+
+        Raises:
+            ValueError: Nếu định dạng không được hỗ trợ
+        """
+        writers = {"ndjson": ExportService.to_ndjson, "csv": ExportService.to_csv, "xlsx": ExportService.to_xlsx}
+        if export_format not in writers:
+            raise ValueError(f"Unsupported export format '{export_format}'")
+        return writers[export_format](ExportService.iter_parking_rows(**filters))
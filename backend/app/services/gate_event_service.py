@@ -0,0 +1,193 @@
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from typing import TYPE_CHECKING
+from app.db.session import run_in_session
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.events import event_broker
+from app.models.parking_lot import ParkingLot
+from app.services.occupancy_service import occupancy
+from datetime import datetime, timedelta, timezone
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Dialect hỗ trợ INSERT ... ON CONFLICT DO NOTHING với partial unique index
+ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+class GateEventService:
+    @staticmethod
+    def toggle_plates(db: Session, plates: list[str]) -> dict[str, str]:
+        """
+        Ghi nhận xe vào / ra cho nhiều biển số trong 1 transaction.
+
+        Xe đang có lượt gửi chưa ra được đóng lượt bằng 1 câu UPDATE ... RETURNING,
+        các xe còn lại được mở lượt mới bằng 1 câu INSERT ... ON CONFLICT DO NOTHING
+        dựa trên unique index uq_parking_lot_open_session. Nếu 2 camera cùng ghi nhận
+        1 xe, chỉ 1 lượt vào được tạo và cả 2 đều trả về "entry".
+
+        Lượt gửi vừa mở / vừa đóng trong GATE_DEDUP_SECONDS được coi là cùng 1 lần qua cổng:
+        không đóng lượt vừa mở (trả về "entry") và không mở lại lượt vừa đóng (trả về "exit").
+        Dưới READ COMMITTED, UPDATE của request thứ 2 chờ request thứ nhất commit rồi không
+        khớp dòng nào; câu SELECT sau đó thấy lượt vừa đóng nên không tạo lượt vào mới.
+
+        Args:
+            db: SQLAlchemy session
+            plates: Biển số đã làm sạch (đã đăng ký)
+
+        Returns:
+            dict[str, str]: Biển số -> "entry" / "exit" / "error"
+        """
+        plates = list(dict.fromkeys(plates))
+        if not plates:
+            return {}
+        insert = ON_CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+        if insert is None:
+            return GateEventService._toggle_each(db, plates)
+
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=settings.GATE_DEDUP_SECONDS)
+        try:
+            exited = set(db.execute(
+                update(ParkingLot)
+                .where(
+                    ParkingLot.license_plate.in_(plates),
+                    ParkingLot.exit_time.is_(None),
+                    ParkingLot.entry_time <= cutoff,
+                )
+                .values(exit_time=now)
+                .returning(ParkingLot.license_plate)
+            ).scalars())
+            remaining = [plate for plate in plates if plate not in exited]
+            recent = {}  # Biển số -> "entry" / "exit" của lượt gửi vừa mở / vừa đóng
+            if remaining:
+                for plate, exit_time in db.execute(
+                    select(ParkingLot.license_plate, ParkingLot.exit_time)
+                    .where(
+                        ParkingLot.license_plate.in_(remaining),
+                        or_(ParkingLot.exit_time.is_(None), ParkingLot.exit_time >= cutoff),
+                    )
+                ):
+                    # Lượt đang mở được ưu tiên hơn lượt vừa đóng
+                    if exit_time is None or plate not in recent:
+                        recent[plate] = "entry" if exit_time is None else "exit"
+            entering = [plate for plate in remaining if plate not in recent]
+            entered = set()
+            if entering:
+                entered = set(db.execute(
+                    insert(ParkingLot)
+                    .values([{"license_plate": plate, "entry_time": now} for plate in entering])
+                    .on_conflict_do_nothing(
+                        index_elements=[ParkingLot.license_plate],
+                        index_where=ParkingLot.exit_time.is_(None),
+                    )
+                    .returning(ParkingLot.license_plate)
+                ).scalars())
+            db.commit()
+        except IntegrityError:
+            # Thường do biển số vừa bị xoá khỏi registered_vehicles: xử lý lại từng biển số
+            db.rollback()
+            return GateEventService._toggle_each(db, plates)
+        # Lượt vào bị bỏ qua do xung đột đã được camera khác ghi và đếm
+        occupancy.record(entered=entered, exited=exited)
+        return {plate: "exit" if plate in exited else recent.get(plate, "entry") for plate in plates}
+
+    @staticmethod
+    def _toggle_each(db: Session, plates: list[str]) -> dict[str, str]:
+        """
+        Ghi nhận từng biển số trong 1 transaction riêng; biển số lỗi trả về "error".
+
+        Dùng khi batch của toggle_plates gặp IntegrityError và cho dialect không có
+        INSERT ... ON CONFLICT. Các dialect đó cũng không có uq_parking_lot_open_session
+        (xem PARTIAL_INDEX_DIALECTS) nên chỉ có khoá dòng của lượt gửi đang mở: 2 camera
+        cùng ghi nhận lượt vào đầu tiên của 1 xe vẫn có thể tạo 2 lượt gửi. Việc chống
+        trùng lượt gửi chỉ được đảm bảo trên PostgreSQL và SQLite.
+        """
+        operations = {}
+        for plate in plates:
+            now = datetime.now(timezone.utc)
+            cutoff = now - timedelta(seconds=settings.GATE_DEDUP_SECONDS)
+            changed = True
+            try:
+                active, recently_opened = (
+                    db.query(ParkingLot, ParkingLot.entry_time > cutoff)
+                    .filter(ParkingLot.license_plate == plate, ParkingLot.exit_time.is_(None))
+                    .with_for_update()
+                    .first()
+                ) or (None, False)
+                if active and recently_opened:
+                    operations[plate], changed = "entry", False
+                elif active:
+                    active.exit_time = now
+                    operations[plate] = "exit"
+                elif db.query(ParkingLot.id).filter(
+                    ParkingLot.license_plate == plate, ParkingLot.exit_time >= cutoff
+                ).first():
+                    operations[plate], changed = "exit", False
+                else:
+                    db.add(ParkingLot(license_plate=plate, entry_time=now, exit_time=None))
+                    operations[plate] = "entry"
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                operations[plate] = "error"
+                continue
+            if not changed:
+                continue
+            if operations[plate] == "exit":
+                occupancy.record(exited=[plate])
+            else:
+                occupancy.record(entered=[plate])
+        return operations
+
+    @staticmethod
+    def process_detection_results(db: Session, results: list[dict], camera_id: str = "default") -> list[dict]:
+        """
+        Ghi nhận xe vào / ra cho các biển số nhận dạng được trong 1 ảnh / frame
+        và phát sự kiện tương ứng tới các client đang nghe /events.
+
+        Args:
+            db: SQLAlchemy session
+            results: Kết quả của detect_license_plates
+            camera_id: Camera chụp ảnh / frame
+
+        Returns:
+            list[dict]: Bản sao kết quả kèm "operation" (entry / exit / error / invalid)
+        """
+        clean_plates = [
+            plate_data["plate"].replace("-", "").replace(" ", "")
+            for plate_data in results if plate_data.get("valid")
+        ]
+        operations = GateEventService.toggle_plates(db, clean_plates)
+        response_results = []
+        for plate_data in results:
+            plate_data_copy = plate_data.copy()
+            if plate_data.get("valid"):
+                clean_plate = plate_data["plate"].replace("-", "").replace(" ", "")
+                plate_data_copy["operation"] = operations.get(clean_plate, "error")
+            else:
+                plate_data_copy["operation"] = "invalid"
+            response_results.append(plate_data_copy)
+            event_broker.publish({
+                **plate_data_copy,
+                "camera_id": camera_id,
+                "license_plate": plate_data["plate"].replace("-", "").replace(" ", ""),
+            })
+        return response_results
+
+    @staticmethod
+    async def process_detection_results_async(db: "AsyncSession | Session", results: list[dict],
+                                              camera_id: str = "default") -> list[dict]:
+        """
+        Bản async của process_detection_results cho các route chạy trên event loop.
+
+        Args:
+            db: SQLAlchemy AsyncSession (hoặc Session khi không có driver async)
+            results: Kết quả của detect_license_plates
+            camera_id: Camera chụp ảnh / frame
+
+        Returns:
+            list[dict]: Bản sao kết quả kèm "operation" (entry / exit / error / invalid)
+        """
+        return await run_in_session(db, GateEventService.process_detection_results, results, camera_id)
@@ -0,0 +1,105 @@
+import threading
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import func
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.parking_lot import ParkingLot
+from app.models.registered_vehicle import RegisteredVehicle
+from app.services.plate_index import plate_index
+
+
+class OccupancyCounter:
+    """
+    Số xe đang trong bãi theo tầng và theo công ty, giữ trong bộ nhớ.
+
+    Được cộng / trừ ngay khi có lượt vào / ra trong process này (thông tin tầng, công ty
+    lấy từ chỉ mục biển số, không truy vấn database), và đối chiếu lại với database mỗi
+    reconcile_seconds bằng 1 câu GROUP BY trên các lượt gửi chưa ra. Lượt vào / ra ghi
+    bởi worker khác hoặc sửa tay chỉ được phản ánh sau lần đối chiếu kế tiếp.
+    """
+
+    def __init__(self, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self._counts = Counter()  # (floor_number, company) -> số xe
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reconciled_at = None
+        self.last_error = None
+
+    def _key(self, license_plate: str):
+        vehicle = plate_index.get(license_plate)
+        if vehicle is None:
+            return None, None
+        return vehicle.floor_number, vehicle.company
+
+    def record(self, entered=(), exited=()) -> None:
+        keys = [(self._key(plate), 1) for plate in entered] + [(self._key(plate), -1) for plate in exited]
+        with self._lock:
+            for key, delta in keys:
+                self._counts[key] += delta
+                if self._counts[key] <= 0:
+                    del self._counts[key]
+
+    def reconcile(self) -> None:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(RegisteredVehicle.floor_number, RegisteredVehicle.company, func.count(ParkingLot.id))
+                .join(RegisteredVehicle, ParkingLot.license_plate == RegisteredVehicle.license_plate)
+                .filter(ParkingLot.exit_time.is_(None))
+                .group_by(RegisteredVehicle.floor_number, RegisteredVehicle.company)
+                .all()
+            )
+        finally:
+            db.close()
+        with self._lock:
+            self._counts = Counter({(floor_number, company): count for floor_number, company, count in rows})
+            self.reconciled_at = datetime.utcnow()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            reconciled_at = self.reconciled_at
+        floors = Counter()
+        companies = Counter()
+        for (floor_number, company), count in counts.items():
+            floors[floor_number] += count
+            companies[company] += count
+        return {
+            "total": sum(counts.values()),
+            "floors": [
+                {"floor_number": floor_number, "count": count}
+                for floor_number, count in sorted(floors.items(), key=lambda item: (item[0] is None, item[0] or 0))
+            ],
+            "companies": [
+                {"company": company, "count": count}
+                for company, count in sorted(companies.items(), key=lambda item: (item[0] is None, item[0] or ""))
+            ],
+            "reconciled_at": reconciled_at,
+        }
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._reconcile_loop, name="occupancy", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _reconcile_loop(self):
+        while True:
+            try:
+                self.reconcile()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            if self._stop.wait(self.reconcile_seconds):
+                break
+
+
+occupancy = OccupancyCounter(settings.OCCUPANCY_RECONCILE_SECONDS)
@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
+from sqlalchemy.exc import IntegrityError
 from app.models.parking_lot import ParkingLot
-from app.models.registered_vehicle import RegisteredVehicle
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
 from app.schemas.parking_lot import ParkingLotCreate, ParkingLotResponse
 from datetime import datetime, timezone
 from sqlalchemy.orm import joinedload
+from app.core.pagination import decode_cursor, fetch_limit, split_page
+from app.services.occupancy_service import occupancy
 
 class ParkingLotService:
     @staticmethod
@@ -20,7 +23,7 @@ class ParkingLotService:
             ParkingLotResponse: Thông tin bản ghi bãi đỗ đã tạo
 
         Raises:
-            ValueError: Nếu license_plate không tồn tại trong registered_vehicles
+            ValueError: Nếu license_plate không tồn tại trong registered_vehicles hoặc xe đang ở trong bãi
         """
         # Kiểm tra xem license_plate có tồn tại trong registered_vehicles không
         db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate == parking.license_plate).first()
@@ -33,7 +36,12 @@ class ParkingLotService:
             exit_time=None
         )
         db.add(db_parking)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("Xe đang ở trong bãi")
+        occupancy.record(entered=[db_parking.license_plate])
         db.refresh(db_parking)
         return ParkingLotResponse.from_orm(db_parking)
 
@@ -58,24 +66,50 @@ class ParkingLotService:
         return ParkingLotResponse.from_orm(db_parking)
 
     @staticmethod
-    def get_parking_lot(db: Session) -> list[ParkingLotResponse]:
+    def list_parking_lot(db: Session, limit: int | None, cursor: str | None = None,
+                         start_time: datetime | None = None, end_time: datetime | None = None,
+                         license_plate: str | None = None, company: str | None = None
+                         ) -> tuple[list[ParkingLotResponse], str | None]:
         """
-        Lấy danh sách các phương tiện .
+        Lấy 1 trang lịch sử gửi xe, mới nhất trước (sắp theo entry_time, id giảm dần).
 
         Args:
             db: SQLAlchemy session
+            limit: Số bản ghi tối đa của trang (None: không phân trang)
+            cursor: Cursor trang tiếp theo từ lần gọi trước
+            start_time, end_time: Lọc theo khoảng thời gian vào
+            license_plate: Lọc theo biển số (không phân biệt dấu, khoảng trắng, hoa thường)
+            company: Lọc theo công ty của xe
 
         Returns:
-            list[ParkingLotResponse]: Danh sách các bản ghi bãi đỗ
+            tuple[list[ParkingLotResponse], str | None]: Các bản ghi và cursor trang sau (None nếu hết)
+
+        Raises:
+            ValueError: Nếu cursor không hợp lệ
         """
+        query = db.query(ParkingLot).options(joinedload(ParkingLot.registered_vehicles))
+        if license_plate or company:
+            query = query.join(RegisteredVehicle, ParkingLot.license_plate == RegisteredVehicle.license_plate)
+        if license_plate:
+            query = query.filter(RegisteredVehicle.normalized_plate == normalize_plate(license_plate))
+        if company:
+            query = query.filter(RegisteredVehicle.company == company)
+        if start_time:
+            query = query.filter(ParkingLot.entry_time >= start_time)
+        if end_time:
+            query = query.filter(ParkingLot.entry_time < end_time)
+        if cursor:
+            entry_time, parking_id = decode_cursor(cursor, datetime, int)
+            query = query.filter(tuple_(ParkingLot.entry_time, ParkingLot.id) < (entry_time, parking_id))
+
         parking_records = (
-            db.query(ParkingLot)
-            .options(joinedload(ParkingLot.registered_vehicles))
-            .order_by(desc(ParkingLot.entry_time))
+            query.order_by(desc(ParkingLot.entry_time), desc(ParkingLot.id))
+            .limit(fetch_limit(limit))
             .all()
         )
-        return [ParkingLotResponse.from_orm(record) for record in parking_records]
-    
+        parking_records, next_cursor = split_page(parking_records, limit, lambda record: (record.entry_time, record.id))
+        return [ParkingLotResponse.from_orm(record) for record in parking_records], next_cursor
+
     @staticmethod
     def get_vehicles_without_exit_time(db: Session) -> list[ParkingLotResponse]:
         """
@@ -119,6 +153,7 @@ class ParkingLotService:
 
         db_parking.exit_time = datetime.now(timezone.utc)
         db.commit()
+        occupancy.record(exited=[db_parking.license_plate])
         db.refresh(db_parking)
         return ParkingLotResponse.from_orm(db_parking)
     
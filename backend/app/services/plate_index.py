@@ -0,0 +1,189 @@
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
+from app.models.registered_vehicle_change import RegisteredVehicleChange
+from app.schemas.registered_vehicle import VehicleResponse
+
+
+class PlateIndex:
+    """
+    Chỉ mục biển số xe đăng ký trong bộ nhớ của process, dùng cho nhận dạng ở cổng.
+
+    Ghi trong process hiện tại được cập nhật ngay (write-through). Các worker khác
+    ghi vào bảng registered_vehicle_changes; thread nền đọc các dòng mới mỗi
+    refresh_seconds và chỉ tải lại các biển số bị thay đổi. Mỗi full_reload_seconds
+    chỉ mục được tải lại toàn bộ và nhật ký cũ hơn retention_hours bị xoá.
+
+    Id nhật ký được cấp lúc INSERT nhưng chỉ đọc được sau COMMIT, nên 1 thay đổi có thể
+    hiện ra sau thay đổi có id lớn hơn. Mỗi lần làm mới vì vậy đọc lại cả các dòng trong
+    lookback_seconds gần nhất và bỏ qua các id đã áp dụng.
+    """
+
+    def __init__(self, refresh_seconds: float, full_reload_seconds: float, retention_hours: float,
+                 lookback_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_seconds = full_reload_seconds
+        self.retention_hours = retention_hours
+        self.lookback_seconds = lookback_seconds
+        self._vehicles = {}  # biển số đã chuẩn hoá -> VehicleResponse
+        self._lock = threading.Lock()
+        self._last_change_id = 0
+        self._applied = {}  # id nhật ký trong khoảng lookback đã áp dụng -> changed_at
+        self._loaded = False
+        self._last_full_reload = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.version = 0
+        self.last_error = None
+
+    def get(self, license_plate: str):
+        """
+        Tra cứu xe theo biển số, không bao giờ truy vấn database (được gọi từ thread
+        nhận dạng và từ event loop). Chỉ mục được tải khi khởi động (start).
+
+        Returns:
+            VehicleResponse | None: Thông tin xe, None nếu chưa đăng ký hoặc chỉ mục chưa tải xong
+        """
+        return self._vehicles.get(normalize_plate(license_plate))
+
+    def plates(self) -> list[str]:
+        return list(self._vehicles)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        db = SessionLocal()
+        try:
+            # Đọc mốc nhật ký trước khi đọc bảng xe để không bỏ sót thay đổi xen giữa
+            last_change_id = db.query(func.max(RegisteredVehicleChange.id)).scalar() or 0
+            vehicles = {
+                (vehicle.normalized_plate or normalize_plate(vehicle.license_plate)): VehicleResponse.from_orm(vehicle)
+                for vehicle in db.query(RegisteredVehicle).all()
+            }
+            cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+            db.query(RegisteredVehicleChange).filter(RegisteredVehicleChange.changed_at < cutoff).delete()
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self._vehicles = vehicles
+            self._last_change_id = max(self._last_change_id, last_change_id)
+            self._loaded = True
+            self._last_full_reload = datetime.utcnow()
+            self.version += 1
+
+    def refresh(self) -> int:
+        """
+        Tải lại các biển số có trong nhật ký thay đổi kể từ lần làm mới trước.
+
+        Returns:
+            int: Số biển số được tải lại
+        """
+        since = datetime.utcnow() - timedelta(seconds=self.lookback_seconds)
+        db = SessionLocal()
+        try:
+            changes = [
+                change for change in (
+                    db.query(RegisteredVehicleChange.id, RegisteredVehicleChange.license_plate,
+                             RegisteredVehicleChange.changed_at)
+                    .filter(or_(RegisteredVehicleChange.id > self._last_change_id,
+                                RegisteredVehicleChange.changed_at >= since))
+                    .order_by(RegisteredVehicleChange.id)
+                    .all()
+                )
+                if change.id not in self._applied
+            ]
+            if not changes:
+                return 0
+            plates = {change.license_plate for change in changes}
+            vehicles = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate.in_(plates)).all()
+        finally:
+            db.close()
+        found = {normalize_plate(vehicle.license_plate): VehicleResponse.from_orm(vehicle) for vehicle in vehicles}
+        with self._lock:
+            for plate in plates:
+                key = normalize_plate(plate)
+                if key in found:
+                    self._vehicles[key] = found[key]
+                else:
+                    self._vehicles.pop(key, None)
+            self._last_change_id = max(self._last_change_id, changes[-1].id)
+            self._applied.update((change.id, change.changed_at) for change in changes)
+            self._applied = {
+                change_id: changed_at for change_id, changed_at in self._applied.items()
+                if changed_at is not None and changed_at >= since
+            }
+            self.version += 1
+        return len(plates)
+
+    def upsert(self, vehicle) -> None:
+        with self._lock:
+            if self._loaded:
+                self._vehicles[normalize_plate(vehicle.license_plate)] = VehicleResponse.from_orm(vehicle)
+                self.version += 1
+
+    def remove(self, license_plate: str) -> None:
+        with self._lock:
+            if self._vehicles.pop(normalize_plate(license_plate), None) is not None:
+                self.version += 1
+
+    @staticmethod
+    def record_change(db: Session, *license_plates: str) -> None:
+        # Gọi trước db.commit() để nhật ký nằm cùng transaction với thay đổi
+        if license_plates:
+            db.execute(insert(RegisteredVehicleChange), [{"license_plate": plate} for plate in set(license_plates)])
+
+    def start(self) -> None:
+        # Tải toàn bộ trước khi nhận request; nếu lỗi (database chưa sẵn sàng) thread nền sẽ thử lại
+        if not self._loaded:
+            try:
+                self.load()
+            except Exception as e:
+                self.last_error = str(e)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="plate-index", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                due = self._last_full_reload is None or \
+                    (datetime.utcnow() - self._last_full_reload).total_seconds() >= self.full_reload_seconds
+                if due:
+                    self.load()
+                else:
+                    self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            if self._stop.wait(self.refresh_seconds):
+                break
+
+    def stats(self) -> dict:
+        return {
+            "plates": len(self._vehicles),
+            "loaded": self._loaded,
+            "version": self.version,
+            "last_change_id": self._last_change_id,
+            "last_error": self.last_error,
+        }
+
+
+plate_index = PlateIndex(
+    settings.PLATE_INDEX_REFRESH_SECONDS,
+    settings.PLATE_INDEX_FULL_RELOAD_SECONDS,
+    settings.PLATE_INDEX_CHANGE_RETENTION_HOURS,
+    settings.PLATE_INDEX_LOOKBACK_SECONDS,
+)
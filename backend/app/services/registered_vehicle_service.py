@@ -1,13 +1,19 @@
+from typing import TYPE_CHECKING
+from app.db.session import run_in_session
 from sqlalchemy.orm import Session
-from app.models.registered_vehicle import RegisteredVehicle
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
 from app.schemas.registered_vehicle import VehicleCreate, VehicleResponse
+from app.services.plate_index import plate_index
+from app.core.pagination import decode_cursor, fetch_limit, split_page
 import re
-from fastapi import HTTPException, UploadFile
+from fastapi import UploadFile
 from pathlib import Path
 import shutil
 import os
-from openpyxl import load_workbook
-from io import BytesIO
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 class VehicleService:
 
     @staticmethod
@@ -42,7 +48,7 @@ class VehicleService:
         vehicle.license_plate = clean_plate
 
         # Kiểm tra license_plate đã tồn tại chưa
-        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate == vehicle.license_plate).first()
+        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.normalized_plate == normalize_plate(vehicle.license_plate)).first()
         if db_vehicle:
             raise ValueError("License plate already registered")
         
@@ -76,73 +82,12 @@ class VehicleService:
             image_path=relative_path
         )
         db.add(db_vehicle)
+        plate_index.record_change(db, db_vehicle.license_plate)
         db.commit()
         db.refresh(db_vehicle)
+        plate_index.upsert(db_vehicle)
         return VehicleResponse.from_orm(db_vehicle)
     
-    @staticmethod
-    def import_vehicles_excel(contents: bytes, db: Session) -> VehicleResponse:
-        workbook = load_workbook(filename=BytesIO(contents))
-        sheet = workbook.active
-        added_vehicles = []
-        base_image_dir = "uploads/vehicles"  # Thư mục chứa ảnh trên server
-
-        for i, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            license_plate, owner_name, phone_number, company, floor_number, image_path = row[:6]
-
-            if not license_plate:
-                continue
-
-            # Kiểm tra xem phương tiện đã tồn tại
-            exists = db.query(RegisteredVehicle).filter_by(license_plate=license_plate).first()
-            if exists:
-                continue
-
-            # Tạo image_path đầy đủ từ license_plate
-            if not image_path:
-                raise HTTPException(status_code=400, detail=f"Dòng {i}: image_path không được để trống")
-
-            # Giả sử image_path trong Excel chỉ là license_plate
-            if image_path != license_plate:
-                raise HTTPException(status_code=400, detail=f"Dòng {i}: image_path '{image_path}' không khớp với biển số '{license_plate}'")
-
-            # Tạo danh sách các file ảnh có thể có với các đuôi khác nhau
-            allowed_extensions = ['.jpg', '.jpeg', '.png']
-            image_full_path = None
-            image_filename = None
-            for ext in allowed_extensions:
-                possible_filename = f"{license_plate}{ext}"
-                possible_full_path = os.path.join(base_image_dir, possible_filename)
-                if os.path.exists(possible_full_path):
-                    image_filename = possible_filename
-                    image_full_path = possible_full_path
-                    break
-
-            if not image_full_path:
-                raise HTTPException(status_code=400, detail=f"Dòng {i}: Không tìm thấy file ảnh cho biển số '{license_plate}' trong '{base_image_dir}'")
-
-            # Tạo image_path đầy đủ để lưu vào DB
-            full_image_path = os.path.join("uploads/vehicles", image_filename).replace("\\", "/")
-
-            vehicle = RegisteredVehicle(
-                license_plate=license_plate,
-                owner_name=owner_name,
-                phone_number=phone_number,
-                company=company,
-                floor_number=floor_number,
-                image_path=full_image_path
-            )
-            db.add(vehicle)
-            added_vehicles.append(1)
-
-        if not added_vehicles:
-            raise HTTPException(status_code=400, detail="Không có phương tiện nào để thêm")
-
-        db.commit()
-        # Lấy phương tiện cuối cùng để trả về (hoặc điều chỉnh theo logic của bạn)
-        db.refresh(vehicle)
-        return VehicleResponse.from_orm(vehicle)
-
     @staticmethod
     def get_vehicle_by_license_plate(db: Session, license_plate: str) -> VehicleResponse:
         """
@@ -158,31 +103,50 @@ class VehicleService:
         Raises:
             ValueError: Nếu phương tiện không tồn tại
         """
-        clean_plate = VehicleService.clean_license_plate(license_plate)
-        license_plate = clean_plate
-
-        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate == license_plate).first()
+        # So khớp trên cột normalized_plate đã được chuẩn hoá sẵn (có index)
+        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.normalized_plate == normalize_plate(license_plate)).first()
         if not db_vehicle:
             raise ValueError("Vehicle not found")
         return VehicleResponse.from_orm(db_vehicle)
     
     @staticmethod
-    def get_all_vehicles(db: Session) -> VehicleResponse:
+    def get_all_vehicles(db: Session, limit: int | None, cursor: str | None = None,
+                         license_plate: str | None = None, company: str | None = None
+                         ) -> tuple[list[VehicleResponse], str | None]:
         """
-        Lấy thông tin phương tiện theo biển số.
+        Lấy 1 trang phương tiện đã đăng ký, sắp theo biển số.
 
         Args:
             db: SQLAlchemy session
-            license_plate: Biển số phương tiện
+            limit: Số phương tiện tối đa của trang (None: không phân trang)
+            cursor: Cursor trang tiếp theo từ lần gọi trước
+            license_plate: Lọc theo phần đầu biển số (đã chuẩn hoá)
+            company: Lọc theo công ty
 
         Returns:
-            VehicleResponse: Schema chứa thông tin phương tiện
+            tuple[list[VehicleResponse], str | None]: Các phương tiện và cursor trang sau (None nếu hết)
 
         Raises:
-            ValueError: Nếu phương tiện không tồn tại
+            ValueError: Nếu cursor không hợp lệ
+        """
+        query = db.query(RegisteredVehicle)
+        if license_plate:
+            query = query.filter(RegisteredVehicle.normalized_plate.startswith(normalize_plate(license_plate)))
+        if company:
+            query = query.filter(RegisteredVehicle.company == company)
+        if cursor:
+            (last_plate,) = decode_cursor(cursor, str)
+            query = query.filter(RegisteredVehicle.license_plate > last_plate)
+        vehicles = query.order_by(RegisteredVehicle.license_plate).limit(fetch_limit(limit)).all()
+        vehicles, next_cursor = split_page(vehicles, limit, lambda vehicle: (vehicle.license_plate,))
+        return [VehicleResponse.from_orm(vehicle) for vehicle in vehicles], next_cursor
+
+    @staticmethod
+    async def get_vehicle_by_license_plate_async(db: "AsyncSession | Session", license_plate: str) -> VehicleResponse:
+        """
+        Bản async của get_vehicle_by_license_plate (db là AsyncSession, hoặc Session khi không có driver async).
         """
-        vehicles = db.query(RegisteredVehicle).all()
-        return [VehicleResponse.from_orm(vehicle) for vehicle in vehicles]
+        return await run_in_session(db, VehicleService.get_vehicle_by_license_plate, license_plate)
 
     @staticmethod
     def update_vehicle(db: Session, license_plate: str, vehicle_update: VehicleCreate) -> VehicleResponse:
@@ -201,22 +165,23 @@ class VehicleService:
             ValueError: Nếu phương tiện không tồn tại
         """
 
-        clean_plate = VehicleService.clean_license_plate(license_plate)
-        license_plate = clean_plate
-
         clean_plate = VehicleService.clean_license_plate(vehicle_update.license_plate)
         vehicle_update.license_plate = clean_plate
 
-        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate == license_plate).first()
+        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.normalized_plate == normalize_plate(license_plate)).first()
         if not db_vehicle:
             raise ValueError("Vehicle not found")
+        license_plate = db_vehicle.license_plate
 
         # Cập nhật các trường từ vehicle_update
         for key, value in vehicle_update.dict(exclude_unset=True).items():
             setattr(db_vehicle, key, value)
 
+        plate_index.record_change(db, license_plate, db_vehicle.license_plate)
         db.commit()
         db.refresh(db_vehicle)
+        plate_index.remove(license_plate)
+        plate_index.upsert(db_vehicle)
         return VehicleResponse.from_orm(db_vehicle)
 
     @staticmethod
@@ -232,12 +197,10 @@ class VehicleService:
             ValueError: Nếu phương tiện không tồn tại
         """
 
-        clean_plate = VehicleService.clean_license_plate(license_plate)
-        license_plate = clean_plate
-
-        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.license_plate == license_plate).first()
+        db_vehicle = db.query(RegisteredVehicle).filter(RegisteredVehicle.normalized_plate == normalize_plate(license_plate)).first()
         if not db_vehicle:
             raise ValueError("Vehicle not found")
+        license_plate = db_vehicle.license_plate
 
         if db_vehicle.image_path:
             BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
@@ -249,6 +212,8 @@ class VehicleService:
                 print(f"File ảnh không tồn tại: {full_image_path}")
 
         db.delete(db_vehicle)
+        plate_index.record_change(db, license_plate)
         db.commit()
+        plate_index.remove(license_plate)
 
     
\ No newline at end of file
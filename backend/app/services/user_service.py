@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from passlib.context import CryptContext
+from app.core.pagination import decode_cursor, fetch_limit, split_page
 
 # Khởi tạo context để băm mật khẩu
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -74,22 +75,32 @@ class UserService:
         return pwd_context.verify(plain_password, hashed_password)
     
     @staticmethod
-    def get_all_users(db: Session) -> UserResponse:
+    def get_all_users(db: Session, limit: int | None, cursor: str | None = None,
+                      username: str | None = None) -> tuple[list[UserResponse], str | None]:
         """
-        Lấy thông tin người dùng theo username.
+        Lấy 1 trang người dùng, sắp theo id.
         
         Args:
             db: SQLAlchemy session
-            username: Tên người dùng cần tìm
+            limit: Số người dùng tối đa của trang (None: không phân trang)
+            cursor: Cursor trang tiếp theo từ lần gọi trước
+            username: Lọc theo phần đầu username
             
         Returns:
-            UserResponse: Schema chứa thông tin người dùng
+            tuple[list[UserResponse], str | None]: Các người dùng và cursor trang sau (None nếu hết)
             
         Raises:
-            ValueError: Nếu người dùng không tồn tại
+            ValueError: Nếu cursor không hợp lệ
         """
-        users = db.query(User).all()
-        return [UserResponse.from_orm(user) for user in users]
+        query = db.query(User)
+        if username:
+            query = query.filter(User.username.startswith(username))
+        if cursor:
+            (last_id,) = decode_cursor(cursor, int)
+            query = query.filter(User.id > last_id)
+        users = query.order_by(User.id).limit(fetch_limit(limit)).all()
+        users, next_cursor = split_page(users, limit, lambda user: (user.id,))
+        return [UserResponse.from_orm(user) for user in users], next_cursor
     
     @staticmethod
     def change_password(db: Session, username: str, new_password: str) -> UserResponse:
@@ -0,0 +1,232 @@
+import os
+from itertools import islice
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.registered_vehicle import RegisteredVehicle, normalize_plate
+from app.schemas.registered_vehicle import VehicleCreate, VehicleImportResponse, VehicleResponse
+from app.services.plate_index import plate_index
+
+IMAGE_DIR = "uploads/vehicles"  # Thư mục chứa ảnh trên server
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")  # Theo thứ tự ưu tiên khi có nhiều file cùng tên
+CHUNK_ROWS = 1000  # Số dòng kiểm tra tồn tại và insert trong 1 transaction
+MAX_REPORTED_ERRORS = 1000
+PHONE_COLUMN = 2
+
+
+class VehicleImportService:
+    @staticmethod
+    def cell_text(value, number_format: str | None = None) -> str | None:
+        """
+        Đọc ô Excel dạng văn bản. Số điện thoại nhập dạng số bị Excel bỏ số 0 ở đầu; nếu ô có
+        định dạng đệm số 0 (ví dụ "0000000000") thì các số 0 đó được khôi phục.
+        """
+        if value is None or isinstance(value, str):
+            return value.strip() if value else value
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, int) and not isinstance(value, bool):
+            text = str(value)
+            if number_format and set(number_format) == {"0"}:
+                text = text.zfill(len(number_format))
+            return text
+        return str(value).strip()
+
+    @staticmethod
+    def list_images(image_dir: str = IMAGE_DIR) -> dict[str, str]:
+        """
+        Đọc thư mục ảnh 1 lần thay vì kiểm tra từng file cho mỗi dòng.
+
+        Returns:
+            dict[str, str]: Tên file không có đuôi -> tên file
+        """
+        images = {}
+        if not os.path.isdir(image_dir):
+            return images
+        priority = {extension: i for i, extension in enumerate(IMAGE_EXTENSIONS)}
+        with os.scandir(image_dir) as entries:
+            for entry in entries:
+                stem, extension = os.path.splitext(entry.name)
+                extension = extension.lower()
+                if extension not in priority or not entry.is_file():
+                    continue
+                current = images.get(stem)
+                if current is None or priority[extension] < priority[os.path.splitext(current)[1].lower()]:
+                    images[stem] = entry.name
+        return images
+
+    @staticmethod
+    def parse_row(row: tuple, images: dict[str, str]) -> dict:
+        """
+        Kiểm tra 1 dòng Excel (license_plate, owner_name, phone_number, company, floor_number, image_path).
+
+        Returns:
+            dict: Giá trị để insert vào registered_vehicles
+
+        Raises:
+            ValueError: Nếu dòng không hợp lệ
+        """
+        license_plate, owner_name, phone_number, company, floor_number, image_path = (tuple(row) + (None,) * 6)[:6]
+        license_plate = VehicleImportService.cell_text(license_plate)
+        phone_number = VehicleImportService.cell_text(phone_number)
+        if not license_plate:
+            raise ValueError("license_plate không được để trống")
+        if not owner_name:
+            raise ValueError("owner_name không được để trống")
+        if not phone_number:
+            raise ValueError("phone_number không được để trống")
+        if floor_number is not None and floor_number != "":
+            try:
+                floor_number = int(floor_number)
+            except (TypeError, ValueError):
+                raise ValueError(f"floor_number '{floor_number}' không phải là số")
+        else:
+            floor_number = None
+        if not image_path:
+            raise ValueError("image_path không được để trống")
+        # Giả sử image_path trong Excel chỉ là license_plate
+        if VehicleImportService.cell_text(image_path) != license_plate:
+            raise ValueError(f"image_path '{image_path}' không khớp với biển số '{license_plate}'")
+        image_filename = images.get(license_plate)
+        if image_filename is None:
+            raise ValueError(f"Không tìm thấy file ảnh cho biển số '{license_plate}' trong '{IMAGE_DIR}'")
+
+        values = {
+            "license_plate": license_plate,
+            "owner_name": str(owner_name).strip(),
+            "phone_number": phone_number,
+            "company": str(company).strip() if company else None,
+            "floor_number": floor_number,
+        }
+        # Cùng ràng buộc với API thêm từng xe (biển số 6-12 ký tự, số điện thoại 10-11 số...)
+        try:
+            VehicleCreate(**values)
+        except ValidationError as e:
+            error = e.errors()[0]
+            raise ValueError(f"{error['loc'][0]}: {error['msg']}")
+        values["image_path"] = f"{IMAGE_DIR}/{image_filename}"
+        values["normalized_plate"] = normalize_plate(license_plate)
+        return values
+
+    @staticmethod
+    def insert_chunk(db: Session, rows: list[tuple[int, dict]], report: dict) -> list[dict]:
+        """
+        Bỏ qua các xe đã tồn tại (1 truy vấn cho cả chunk) rồi insert phần còn lại trong 1 transaction.
+        Nếu insert lỗi (ví dụ worker khác vừa thêm cùng biển số) thì insert lại từng dòng.
+
+        Returns:
+            list[dict]: Các xe đã được thêm
+        """
+        keys = {values["normalized_plate"] for _, values in rows}
+        existing = set(db.scalars(select(RegisteredVehicle.normalized_plate).where(RegisteredVehicle.normalized_plate.in_(keys))))
+        new_rows = []
+        for row_number, values in rows:
+            if values["normalized_plate"] in existing:
+                report["skipped"] += 1
+            else:
+                new_rows.append((row_number, values))
+        if not new_rows:
+            return []
+
+        try:
+            db.execute(insert(RegisteredVehicle), [values for _, values in new_rows])
+            plate_index.record_change(db, *(values["license_plate"] for _, values in new_rows))
+            db.commit()
+            return [values for _, values in new_rows]
+        except IntegrityError:
+            db.rollback()
+
+        inserted = []
+        for row_number, values in new_rows:
+            try:
+                db.execute(insert(RegisteredVehicle), values)
+                plate_index.record_change(db, values["license_plate"])
+                db.commit()
+                inserted.append(values)
+            except IntegrityError:
+                db.rollback()
+                VehicleImportService.add_error(report, row_number, values["license_plate"], "Biển số đã tồn tại")
+        return inserted
+
+    @staticmethod
+    def add_error(report: dict, row_number: int, license_plate, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "license_plate": license_plate, "error": error})
+
+    @staticmethod
+    def import_excel(file, db: Session) -> VehicleImportResponse:
+        """
+        Thêm phương tiện hàng loạt từ file Excel, đọc từng dòng ở chế độ read-only.
+
+        Dòng không hợp lệ không làm dừng cả file mà được ghi vào báo cáo lỗi; xe đã tồn tại
+        (so theo biển số đã chuẩn hoá) được bỏ qua.
+
+        Args:
+            file: File Excel (file-like, có thể seek)
+            db: SQLAlchemy session
+
+        Returns:
+            VehicleImportResponse: Số dòng đã đọc / đã thêm / bỏ qua / lỗi và lỗi theo từng dòng
+
+        Raises:
+            ValueError: Nếu file không phải Excel hợp lệ
+        """
+        try:
+            workbook = load_workbook(filename=file, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValueError(f"File Excel không hợp lệ: {e}")
+
+        images = VehicleImportService.list_images()
+        report = {"total_rows": 0, "inserted": 0, "skipped": 0, "failed": 0, "errors": []}
+        seen = set()  # Biển số đã gặp trong file
+        try:
+            rows = enumerate(workbook.active.iter_rows(min_row=2), start=2)
+            while chunk := list(islice(rows, CHUNK_ROWS)):
+                valid_rows = []
+                for row_number, cells in chunk:
+                    row = [cell.value for cell in cells]
+                    if not row or not row[0]:
+                        continue
+                    if len(cells) > PHONE_COLUMN:
+                        phone_cell = cells[PHONE_COLUMN]
+                        row[PHONE_COLUMN] = VehicleImportService.cell_text(
+                            phone_cell.value, getattr(phone_cell, "number_format", None))
+                    report["total_rows"] += 1
+                    try:
+                        values = VehicleImportService.parse_row(row, images)
+                    except ValueError as e:
+                        VehicleImportService.add_error(report, row_number, str(row[0]), str(e))
+                        continue
+                    if values["normalized_plate"] in seen:
+                        VehicleImportService.add_error(report, row_number, values["license_plate"], "Biển số bị trùng trong file")
+                        continue
+                    seen.add(values["normalized_plate"])
+                    valid_rows.append((row_number, values))
+                if valid_rows:
+                    for values in VehicleImportService.insert_chunk(db, valid_rows, report):
+                        report["inserted"] += 1
+                        plate_index.upsert(VehicleResponse(**values))
+        finally:
+            workbook.close()
+
+        if report["inserted"]:
+            status = "partial" if report["failed"] else "success"
+            message = f"Đã thêm {report['inserted']} phương tiện"
+            if report["skipped"]:
+                message += f", bỏ qua {report['skipped']} phương tiện đã tồn tại"
+            if report["failed"]:
+                message += f", {report['failed']} dòng bị lỗi"
+        else:
+            status = "error"
+            message = "Không có phương tiện nào để thêm"
+            details = []
+            if report["skipped"]:
+                details.append(f"{report['skipped']} phương tiện đã tồn tại")
+            if report["failed"]:
+                details.append(f"{report['failed']} dòng bị lỗi")
+            if details:
+                message += f" ({', '.join(details)})"
+        return VehicleImportResponse(status=status, message=message, **report)
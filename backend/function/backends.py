@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Backend suy luận: "pytorch" (weights .pt gốc), "torchscript" hoặc "onnx" (ONNX Runtime).
+# Weights được export 1 lần bằng yolov5/export.py và lưu trong EXPORT_DIR;
+# torch.hub.load('yolov5', 'custom', path=...) tự chọn backend theo đuôi file.
+BACKENDS = ("pytorch", "torchscript", "onnx")
+EXPORT_SUFFIXES = {"torchscript": ".torchscript", "onnx": ".onnx"}
+EXPORT_DIR = "model/exported"
+EXPORT_IMGSZ = 640
+
+
+def exported_path(weights: str, backend: str) -> str:
+    return os.path.join(EXPORT_DIR, Path(weights).stem + EXPORT_SUFFIXES[backend])
+
+
+def ensure_exported(weights: str, backend: str) -> str:
+    """
+    Trả về đường dẫn weights cho backend, export nếu chưa có hoặc weights gốc mới hơn.
+
+    Args:
+        weights: Đường dẫn file .pt gốc
+        backend: Một trong BACKENDS
+
+    Returns:
+        str: Đường dẫn file model dùng để load
+
+    Raises:
+        ValueError: Nếu backend không được hỗ trợ
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported inference backend '{backend}'")
+    if backend == "pytorch":
+        return weights
+
+    target = exported_path(weights, backend)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(weights):
+        return target
+
+    print(f"Exporting {weights} to {backend}...")
+    include = "torchscript" if backend == "torchscript" else "onnx"
+    cmd = [sys.executable, "yolov5/export.py", "--weights", weights, "--include", include, "--imgsz", str(EXPORT_IMGSZ)]
+    if backend == "onnx":
+        # batch động để dùng được với micro-batching
+        cmd.append("--dynamic")
+    subprocess.run(cmd, check=True)
+
+    # export.py ghi file cạnh weights gốc, chuyển vào thư mục cache
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    os.replace(str(Path(weights).with_suffix(EXPORT_SUFFIXES[backend])), target)
+    return target
+
+
+def check_parity(backend: str, image_dir: str = "uploads/vehicles", box_tol: float = 2.0) -> bool:
+    """
+    So sánh kết quả của backend với PyTorch gốc trên các ảnh mẫu.
+
+    Kiểm tra số lượng và toạ độ box của LP_detector (sai lệch <= box_tol pixel)
+    và chuỗi biển số đọc được bởi LP_ocr.
+
+    Returns:
+        bool: True nếu tất cả ảnh cho kết quả tương đương
+    """
+    import cv2
+    import numpy as np
+    from function import helper
+    from function.model_registry import ModelRegistry, MODEL_PATHS
+
+    reference = ModelRegistry(MODEL_PATHS, "pytorch")
+    candidate = ModelRegistry(MODEL_PATHS, backend)
+    ok = True
+    for image_path in sorted(Path(image_dir).iterdir()):
+        img = cv2.imread(str(image_path))
+        if img is None:
+            continue
+        ref_boxes = reference.get("detector")(img, size=640).xyxy[0].cpu().numpy()
+        cand_boxes = candidate.get("detector")(img, size=640).xyxy[0].cpu().numpy()
+        same_boxes = len(ref_boxes) == len(cand_boxes) and (
+            len(ref_boxes) == 0 or np.abs(ref_boxes[:, :4] - cand_boxes[:, :4]).max() <= box_tol
+        )
+
+        crops = [img[int(y1):int(y2), int(x1):int(x2)] for x1, y1, x2, y2 in ref_boxes[:, :4]] or [img]
+        ref_plates = helper.read_plates(reference.get("ocr"), crops)
+        cand_plates = helper.read_plates(candidate.get("ocr"), crops)
+
+        status = "OK" if same_boxes and ref_plates == cand_plates else "MISMATCH"
+        ok = ok and status == "OK"
+        print(f"{status:8} {image_path.name}: boxes {len(ref_boxes)}/{len(cand_boxes)} plates {ref_plates} / {cand_plates}")
+    return ok
+
+
+# Kiểm tra tương đương: python -m function.backends onnx
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "onnx"
+    sys.exit(0 if check_parity(backend) else 1)
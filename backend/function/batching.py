@@ -0,0 +1,83 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Gom các ảnh được gửi từ nhiều request đồng thời thành 1 batch rồi chạy model 1 lần.
+
+    batch_fn nhận list ảnh và trả về list kết quả cùng độ dài, cùng thứ tự.
+    Worker chờ tối đa max_wait_ms sau ảnh đầu tiên để gom thêm, hoặc chạy ngay
+    khi đủ max_batch_size ảnh. Mỗi request chỉ nhận lại kết quả của chính nó.
+    """
+
+    def __init__(self, batch_fn, max_batch_size: int, max_wait_ms: float, name: str = "batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, item) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def submit_many(self, items) -> list[Future]:
+        return [self.submit(item) for item in items]
+
+    def run(self, item):
+        return self.submit(item).result()
+
+    def run_many(self, items) -> list:
+        return [future.result() for future in self.submit_many(items)]
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                # Lấy ngay các ảnh đã có sẵn trong hàng đợi, chỉ chờ khi hàng đợi rỗng
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                results = list(self.batch_fn(items))
+                if len(results) != len(futures):
+                    # Không biết kết quả nào thuộc về ảnh nào: báo lỗi cho cả batch thay vì để
+                    # các request thiếu kết quả chờ mãi
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(futures)} items")
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
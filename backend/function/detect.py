@@ -1,24 +1,47 @@
 import cv2
-import torch
 import numpy as np
+from io import BytesIO
+from PIL import Image
 from function import helper, utils_rotate
-from app.services.registered_vehicle_service import VehicleService
-from app.db.session import SessionLocal
+from function.batching import MicroBatcher
+from function.model_registry import model_registry
+from function.motion_gate import GATE_SIZE, MotionGate
+from function.plate_match import PlateMatcher
+from function.result_cache import ResultCache, exact_key, perceptual_hash
+from app.services.plate_index import normalize_plate, plate_index
+from app.core.config import settings
 
-# Load models chỉ 1 lần
-yolo_LP_detect = torch.hub.load('yolov5', 'custom', path='model/LP_detector.pt', force_reload=True, source='local')
-yolo_license_plate = torch.hub.load('yolov5', 'custom', path='model/LP_ocr.pt', force_reload=True, source='local')
-yolo_license_plate.conf = 0.60
+# Model được load khi dùng lần đầu hoặc khi warm-up (xem function/model_registry.py)
+def detect_plates_batch(imgs):
+    results = model_registry.get("detector")(imgs, size=640)
+    return [det.cpu().numpy().tolist() for det in results.xyxy]
+
+def read_plates_batch(ims):
+    return helper.read_plates_scored(model_registry.get("ocr"), ims)
+
+# Gom ảnh từ các request đồng thời, mỗi model chạy 1 lần cho cả batch
+detect_batcher = MicroBatcher(detect_plates_batch, settings.DETECT_MAX_BATCH_SIZE, settings.DETECT_MAX_WAIT_MS, name="detect-batcher")
+ocr_batcher = MicroBatcher(read_plates_batch, settings.OCR_MAX_BATCH_SIZE, settings.OCR_MAX_WAIT_MS, name="ocr-batcher")
+
+# Frame trùng / gần giống (làn trống, xe đang chờ) dùng lại kết quả, không chạy model
+result_cache = ResultCache(settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_TTL_SECONDS, settings.RESULT_CACHE_MAX_HAMMING)
+
+# Làn trống / frame tĩnh bị bỏ qua trước khi chạy model phát hiện biển số
+motion_gate = MotionGate(settings.MOTION_GATE_ALPHA, settings.MOTION_PIXEL_THRESHOLD,
+                         settings.MOTION_MIN_ACTIVITY, settings.MOTION_MAX_SKIP_SECONDS)
+
+# Biển số đọc gần đúng (nhầm 0/O, 8/B...) được khớp với biển số đăng ký gần nhất
+plate_matcher = PlateMatcher(plate_index, settings.PLATE_MATCH_MAX_DISTANCE)
+
+SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
 
 def preprocess_image(img):
     if len(img.shape) == 2:
         img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    equalized = clahe.apply(gray)
+    equalized = utils_rotate.get_clahe(2.0).apply(gray)
     blurred = cv2.GaussianBlur(equalized, (3, 3), 0)
-    sharpen_kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
-    sharpened = cv2.filter2D(blurred, -1, sharpen_kernel)
+    sharpened = cv2.filter2D(blurred, -1, SHARPEN_KERNEL)
     return cv2.cvtColor(sharpened, cv2.COLOR_GRAY2BGR)
 
 def format_license_plate(plate):
@@ -29,53 +52,210 @@ def format_license_plate(plate):
     formatted_number = number
     return f"{formatted_code} {formatted_number}"
 
-def detect_license_plates(image_bytes):
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    results = yolo_LP_detect(img, size=640)
-    list_plates = results.pandas().xyxy[0].values.tolist()
-    list_read_plates = set()
-    results_info = []
-    db = SessionLocal()
+def run_ocr(ims):
+    if settings.OCR_BATCH_MODE:
+        return ocr_batcher.run_many(ims)
+    return [helper.read_plate_scored(model_registry.get("ocr"), im) for im in ims]
+
+def is_confident(reading):
+    return reading.text != "unknown" and reading.confidence >= settings.OCR_CONFIDENCE_THRESHOLD
+
+def vote_readings(readings):
+    # Cộng độ tin cậy theo từng chuỗi đọc được, chọn chuỗi có tổng cao nhất
+    scores = {}
+    best = {}
+    for reading in readings:
+        if reading.text == "unknown":
+            continue
+        scores[reading.text] = scores.get(reading.text, 0.0) + reading.confidence
+        if reading.text not in best or reading.confidence > best[reading.text].confidence:
+            best[reading.text] = reading
+    if not scores:
+        return helper.UNKNOWN_READING
+    return best[max(scores, key=scores.get)]
+
+def read_plate_crops(img, list_plates):
+    """
+    Đọc biển số cho từng box, trả về 1 PlateReading cho mỗi box (text "unknown" nếu không đọc được).
+
+    Các biến thể deskew được OCR theo từng lượt (OCR_VARIANTS_PER_PASS biến thể / biển, gộp
+    chung 1 batch cho mọi biển). Biển nào đã có kết quả đạt OCR_CONFIDENCE_THRESHOLD thì dừng;
+    còn lại bỏ phiếu trên tối đa OCR_MAX_VARIANTS biến thể. Với PLATE_RECTIFY_MODE="perspective"
+    mỗi biển chỉ có 1 ảnh nắn phẳng nên chỉ cần 1 lần OCR.
+    """
+    max_variants = max(1, min(4, settings.OCR_MAX_VARIANTS))
+    per_pass = max(1, settings.OCR_VARIANTS_PER_PASS) if settings.OCR_BATCH_MODE else 1
+    variants = []
+    for plate in list_plates:
+        x1, y1, x2, y2 = map(int, plate[:4])
+        preprocessed_img = preprocess_image(img[y1:y2, x1:x2])
+        if settings.PLATE_RECTIFY_MODE == "perspective":
+            # 1 ảnh đã nắn phẳng duy nhất cho mỗi biển số
+            variants.append([utils_rotate.rectify(preprocessed_img)])
+        else:
+            variants.append(utils_rotate.deskew_variants(preprocessed_img)[:max_variants])
+
+    readings = [[] for _ in list_plates]
+    ocr_cache = {}
+    pending = list(range(len(list_plates)))
+    for start in range(0, max_variants, per_pass):
+        batch = [(i, variant) for i in pending for variant in variants[i][start:start + per_pass]]
+        # deskew_variants dùng lại cùng 1 ảnh khi góc xoay trùng nhau: mỗi ảnh chỉ OCR 1 lần
+        new_images = list({id(v): v for _, v in batch if id(v) not in ocr_cache}.values())
+        ocr_cache.update(zip(map(id, new_images), run_ocr(new_images)))
+        for i, variant in batch:
+            readings[i].append(ocr_cache[id(variant)])
+        pending = [i for i in pending if not any(is_confident(r) for r in readings[i])]
+        if not pending:
+            break
+    return [vote_readings(r) for r in readings]
+
+def read_tracked_plates(img, list_plates, tracker):
+    # Chỉ OCR các track mới / chưa ổn định, kết quả được bỏ phiếu qua nhiều frame
+    tracks = tracker.update(list_plates)
+    pending = [(track, plate) for track, plate in zip(tracks, list_plates) if tracker.needs_ocr(track)]
+    readings = read_plate_crops(img, [plate for _, plate in pending])
+    for (track, _), reading in zip(pending, readings):
+        if reading.text == "unknown":
+            tracker.add_reading(track, None)
+        else:
+            tracker.add_reading(track, reading.text, reading.confidence)
+    return dict(tracker.pop_confirmed())
+
+REDUCED_DECODE_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
 
-    if not list_plates:
-        lp = helper.read_plate(yolo_license_plate, img)
-        if lp != "unknown":
-            list_read_plates.add(lp)
+def choose_decode_scale(image_bytes):
+    # Đọc kích thước từ header ảnh (không giải mã) để chọn mức giảm độ phân giải lớn nhất
+    # mà cạnh dài vẫn >= DETECT_DECODE_MIN_SIDE
+    if not settings.DETECT_REDUCED_DECODE:
+        return 1
+    try:
+        with Image.open(BytesIO(image_bytes)) as im:
+            long_side = max(im.size)
+    except Exception:
+        return 1
+    for scale in (8, 4, 2):
+        if long_side // scale >= settings.DETECT_DECODE_MIN_SIDE:
+            return scale
+    return 1
+
+def detect_license_plates(image_bytes, camera_id=None):
+    nparr = np.frombuffer(image_bytes, np.uint8)  # dùng trực tiếp buffer upload, không copy
+    if not settings.RESULT_CACHE_ENABLED and not settings.MOTION_GATE_ENABLED:
+        return decode_and_detect(nparr, image_bytes, camera_id)
+    # Ảnh không rõ camera có thể đến từ nhiều client khác nhau: không so với ảnh nền / hash
+    # cảm nhận của nhau, chỉ dùng cache theo hash chính xác
+    gated = settings.MOTION_GATE_ENABLED and camera_id is not None
+    perceptual = settings.RESULT_CACHE_ENABLED and camera_id is not None
+
+    # Ảnh xám giải mã ở 1/8 độ phân giải (rất rẻ với JPEG) cho cả hash cảm nhận và motion gate
+    thumbnail = cv2.imdecode(nparr, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if thumbnail is None:
+        return decode_and_detect(nparr, image_bytes, camera_id)
+    if settings.RESULT_CACHE_ENABLED:
+        digest = exact_key(image_bytes)
+        cached = result_cache.lookup_exact(camera_id, digest)
+        if cached is not None:
+            return cached
+        phash = perceptual_hash(thumbnail)
+
+    if gated and not motion_gate.should_process(camera_id, thumbnail):
+        return []
+
+    # Frame có chuyển động (ví dụ xe vừa tới) luôn được nhận dạng lại, không dùng hash cảm nhận
+    if perceptual and not (gated and motion_gate.is_moving(camera_id)):
+        cached = result_cache.lookup_similar(camera_id, phash)
+        if cached is not None:
+            return cached
+    elif settings.RESULT_CACHE_ENABLED:
+        result_cache.count_miss()
+
+    results_info = decode_and_detect(nparr, image_bytes, camera_id)
+    if settings.RESULT_CACHE_ENABLED:
+        result_cache.store(camera_id, digest, phash, results_info)
+    return results_info
+
+def decode_and_detect(nparr, image_bytes, camera_id="default"):
+    scale = choose_decode_scale(image_bytes)
+    if scale == 1:
+        return detect_license_plates_image(cv2.imdecode(nparr, cv2.IMREAD_COLOR), camera_id=camera_id)
+    # Phát hiện biển số trên ảnh giảm độ phân giải; ảnh gốc chỉ được giải mã khi có biển số để cắt
+    img = cv2.imdecode(nparr, REDUCED_DECODE_FLAGS[scale])
+    return detect_license_plates_image(img, load_full_image=lambda: cv2.imdecode(nparr, cv2.IMREAD_COLOR),
+                                       camera_id=camera_id)
+
+def detect_stream_frame(frame, tracker, camera_id):
+    # Frame từ video stream: bỏ qua frame tĩnh, trừ khi tracker còn đang theo dõi xe
+    if settings.MOTION_GATE_ENABLED:
+        gray = cv2.cvtColor(cv2.resize(frame, GATE_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        active = tracker is not None and tracker.active_tracks > 0
+        if not motion_gate.should_process(camera_id, gray, force=active):
+            return []
+    return detect_license_plates_image(frame, tracker, camera_id=camera_id)
+
+def to_full_resolution(img, full_img, list_plates):
+    fx = full_img.shape[1] / img.shape[1]
+    fy = full_img.shape[0] / img.shape[0]
+    return [[plate[0] * fx, plate[1] * fy, plate[2] * fx, plate[3] * fy] + list(plate[4:]) for plate in list_plates]
+
+def detect_license_plates_image(img, tracker=None, load_full_image=None, camera_id="default"):
+    # Nhận ảnh BGR đã giải mã (upload hoặc frame từ video stream).
+    # load_full_image: nếu img là ảnh thu nhỏ, hàm trả về ảnh gốc để cắt vùng biển số
+    list_plates = detect_batcher.run(img)
+    crop_img = img
+    if list_plates and load_full_image is not None:
+        crop_img = load_full_image()
+        list_plates = to_full_resolution(img, crop_img, list_plates)
+
+    if tracker is not None:
+        # Video stream: chỉ trả về các xe vừa được xác nhận
+        list_read_plates = read_tracked_plates(crop_img, list_plates, tracker)
+    elif not list_plates:
+        # OCR cả ảnh chỉ bật cho camera đặt sát biển số (FULL_FRAME_OCR_CAMERAS)
+        readings = run_ocr([img]) if camera_id in settings.FULL_FRAME_OCR_CAMERAS else []
     else:
-        for plate in list_plates:
-            x1, y1, x2, y2 = map(int, plate[:4])
-            crop_img = img[y1:y2, x1:x2]
-            for cc in range(2):
-                for ct in range(2):
-                    preprocessed_img = preprocess_image(crop_img)
-                    lp = helper.read_plate(yolo_license_plate, utils_rotate.deskew(preprocessed_img, cc, ct))
-                    if lp != "unknown":
-                        list_read_plates.add(lp)
-                        break
-                else:
-                    continue
-                break
-
-    for plate in list_read_plates:
-        try:
-            info = VehicleService.get_vehicle_by_license_plate(db, plate)
-            formatted_lp = format_license_plate(plate)
+        readings = read_plate_crops(crop_img, list_plates)
+    if tracker is None:
+        list_read_plates = {}
+        for reading in readings:
+            if reading.text != "unknown":
+                list_read_plates[reading.text] = max(reading.confidence, list_read_plates.get(reading.text, 0.0))
+    return lookup_plates(list_read_plates)
+
+def lookup_plates(list_read_plates):
+    # list_read_plates: {biển số: độ tin cậy}
+    # Tra cứu trên chỉ mục trong bộ nhớ (app/services/plate_index.py), không truy vấn database
+    results_info = []
+    matched = set()
+    # Đọc chính xác trước, độ tin cậy cao trước: 2 chuỗi khớp cùng 1 xe chỉ giữ kết quả đầu tiên
+    ordered = sorted(list_read_plates.items(), key=lambda item: (plate_index.get(item[0]) is None, -item[1]))
+    for plate, confidence in ordered:
+        info = plate_index.get(plate)
+        distance = 0
+        if info is None and settings.PLATE_FUZZY_MATCH_ENABLED:
+            match = plate_matcher.match(normalize_plate(plate))
+            if match is not None:
+                info = plate_index.get(match[0])
+                distance = match[1]
+        if info is not None:
+            if info.license_plate in matched:
+                continue
+            matched.add(info.license_plate)
             results_info.append({
-                "plate": formatted_lp,
+                "plate": format_license_plate(info.license_plate),
                 "name": info.owner_name,
                 "companyName": info.company,
                 "companyFloor": info.floor_number,
                 "phone": info.phone_number,
+                "confidence": round(confidence, 3),
+                "matchDistance": distance,
                 "valid": True
             })
-        except ValueError:
-            formatted_lp = format_license_plate(plate)
+        else:
             results_info.append({
-                "plate": formatted_lp,
+                "plate": format_license_plate(plate),
                 "message": "Chưa được đăng ký",
+                "confidence": round(confidence, 3),
                 "valid": False
             })
-
-
-    return results_info
\ No newline at end of file
+    return results_info
@@ -1,4 +1,13 @@
 import math
+from typing import NamedTuple
+import numpy as np
+
+class PlateReading(NamedTuple):
+    text: str
+    confidence: float  # trung bình độ tin cậy các ký tự
+    char_confidences: list
+
+UNKNOWN_READING = PlateReading("unknown", 0.0, [])
 
 # license plate type classification helper function
 def linear_equation(x1, y1, x2, y2):
@@ -13,51 +22,52 @@ def check_point_linear(x, y, x1, y1, x2, y2):
 
 # detect character and number in license plate
 def read_plate(yolo_license_plate, im):
-    LP_type = "1"
+    return read_plate_scored(yolo_license_plate, im).text
+
+def read_plate_scored(yolo_license_plate, im):
     results = yolo_license_plate(im)
-    bb_list = results.pandas().xyxy[0].values.tolist()
-    if len(bb_list) == 0 or len(bb_list) < 7 or len(bb_list) > 10:
-        return "unknown"
-    center_list = []
-    y_mean = 0
-    y_sum = 0
-    for bb in bb_list:
-        x_c = (bb[0]+bb[2])/2
-        y_c = (bb[1]+bb[3])/2
-        y_sum += y_c
-        center_list.append([x_c,y_c,bb[-1]])
-
-    # find 2 point to draw line
-    l_point = center_list[0]
-    r_point = center_list[0]
-    for cp in center_list:
-        if cp[0] < l_point[0]:
-            l_point = cp
-        if cp[0] > r_point[0]:
-            r_point = cp
-    for ct in center_list:
-        if l_point[0] != r_point[0]:
-            if (check_point_linear(ct[0], ct[1], l_point[0], l_point[1], r_point[0], r_point[1]) == False):
-                LP_type = "2"
-
-    y_mean = int(int(y_sum) / len(bb_list))
-    size = results.pandas().s
+    return decode_plate_scored(results.xyxy[0].cpu().numpy(), results.names)
+
+# run OCR model once for a batch of images, one reading per image
+def read_plates(yolo_license_plate, ims):
+    return [reading.text for reading in read_plates_scored(yolo_license_plate, ims)]
+
+def read_plates_scored(yolo_license_plate, ims):
+    if len(ims) == 0:
+        return []
+    results = yolo_license_plate(list(ims))
+    return [decode_plate_scored(det.cpu().numpy(), results.names) for det in results.xyxy]
+
+# order character boxes (rows of x1, y1, x2, y2, conf, cls) into plate string
+def decode_plate_scored(boxes, names):
+    if len(boxes) < 7 or len(boxes) > 10:
+        return UNKNOWN_READING
+    # float64 để kết quả giống hệt cách tính trên list Python trước đây
+    boxes = np.asarray(boxes, dtype=np.float64)
+    x_c = (boxes[:, 0] + boxes[:, 2]) / 2
+    y_c = (boxes[:, 1] + boxes[:, 3]) / 2
+    chars = [str(names[int(c)]) for c in boxes[:, 5]]
+
+    # find 2 point to draw line, 2 line plate if any center is off that line
+    l_idx = int(np.argmin(x_c))
+    r_idx = int(np.argmax(x_c))
+    LP_type = "1"
+    if x_c[l_idx] != x_c[r_idx]:
+        a, b = linear_equation(float(x_c[l_idx]), float(y_c[l_idx]), float(x_c[r_idx]), float(y_c[r_idx]))
+        y_pred = a * x_c + b
+        tol = np.maximum(1e-09 * np.maximum(np.abs(y_pred), np.abs(y_c)), 3)
+        if np.any(np.abs(y_pred - y_c) > tol):
+            LP_type = "2"
 
     # 1 line plates and 2 line plates
-    line_1 = []
-    line_2 = []
-    license_plate = ""
     if LP_type == "2":
-        for c in center_list:
-            if int(c[1]) > y_mean:
-                line_2.append(c)
-            else:
-                line_1.append(c)
-        for l1 in sorted(line_1, key = lambda x: x[0]):
-            license_plate += str(l1[2])
-        for l2 in sorted(line_2, key = lambda x: x[0]):
-            license_plate += str(l2[2])
+        y_mean = int(int(sum(y_c.tolist())) / len(boxes))
+        is_line_2 = y_c.astype(np.int64) > y_mean
+        order = np.concatenate([
+            np.flatnonzero(~is_line_2)[np.argsort(x_c[~is_line_2], kind="stable")],
+            np.flatnonzero(is_line_2)[np.argsort(x_c[is_line_2], kind="stable")],
+        ])
     else:
-        for l in sorted(center_list, key = lambda x: x[0]):
-            license_plate += str(l[2])
-    return license_plate
\ No newline at end of file
+        order = np.argsort(x_c, kind="stable")
+    char_confidences = boxes[order, 4].tolist()
+    return PlateReading("".join(chars[i] for i in order), sum(char_confidences) / len(char_confidences), char_confidences)
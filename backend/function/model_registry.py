@@ -0,0 +1,86 @@
+import os
+import threading
+import numpy as np
+from app.core.config import settings
+from function.backends import ensure_exported
+from function.quantize import ensure_quantized
+
+MODEL_PATHS = {
+    "detector": "model/LP_detector.pt",
+    "ocr": "model/LP_ocr.pt",
+}
+
+# Cache model theo (đường dẫn, mtime, backend, lượng tử hoá): chỉ load lại khi file weights thay đổi
+_model_cache = {}
+
+
+class ModelRegistry:
+    """
+    Load các model YOLO khi cần (hoặc khi warm-up), không load lúc import module.
+
+    Worker chỉ phục vụ CRUD sẽ không phải import torch hay load model.
+    """
+
+    def __init__(self, model_paths: dict, backend: str, ocr_quantization: str = "none"):
+        self.model_paths = model_paths
+        self.backend = backend
+        self.ocr_quantization = ocr_quantization
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.warmup_error = None
+
+    def get(self, name: str):
+        path = self.model_paths[name]
+        key = (path, os.path.getmtime(path), self.backend, name == "ocr" and self.ocr_quantization)
+        model = _model_cache.get(key)
+        if model is None:
+            with self._lock:
+                model = _model_cache.get(key)
+                if model is None:
+                    model = self._load(name, path)
+                    _model_cache[key] = model
+        return model
+
+    def _load(self, name: str, path: str):
+        import torch
+
+        if name == "ocr" and self.ocr_quantization == "int8":
+            model_path = ensure_quantized(path)
+        else:
+            model_path = ensure_exported(path, self.backend)
+        print(f"Loading model {name} from {model_path}...")
+        model = torch.hub.load('yolov5', 'custom', path=model_path, source='local')
+        if name == "ocr":
+            model.conf = 0.60
+        return model
+
+    def warm_up(self):
+        """
+        Load tất cả model và chạy thử 1 lần với ảnh rỗng để khởi tạo các kernel.
+        """
+        try:
+            dummy = np.zeros((640, 640, 3), dtype=np.uint8)
+            self.get("detector")(dummy, size=640)
+            self.get("ocr")(dummy)
+        except Exception as e:
+            self.warmup_error = str(e)
+            print(f"Model warm-up failed: {e}")
+            raise
+        self.warmup_error = None
+        self._ready.set()
+        print("Model warm-up finished.")
+
+    def start_warm_up(self):
+        threading.Thread(target=self._warm_up_quietly, name="model-warmup", daemon=True).start()
+
+    def _warm_up_quietly(self):
+        try:
+            self.warm_up()
+        except Exception:
+            pass
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+
+model_registry = ModelRegistry(MODEL_PATHS, settings.INFERENCE_BACKEND, settings.OCR_QUANTIZATION)
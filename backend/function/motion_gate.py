@@ -0,0 +1,93 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+# Kích thước ảnh xám dùng để so sánh với nền, đủ nhỏ để mỗi frame tốn < 1ms
+GATE_SIZE = (160, 120)
+
+
+class MotionGate:
+    """
+    Bỏ qua frame tĩnh / làn trống trước khi chạy model, theo từng camera.
+
+    Mỗi camera có 1 ảnh nền (trung bình trượt của các frame thu nhỏ). Độ hoạt động
+    của frame là tỉ lệ điểm ảnh lệch khỏi nền quá pixel_threshold; frame có độ hoạt
+    động dưới min_activity bị bỏ qua, trừ khi đã quá max_skip_seconds chưa xử lý
+    frame nào (tránh bỏ sót xe dừng lâu đã hoà vào nền).
+    """
+
+    def __init__(self, alpha: float, pixel_threshold: int, min_activity: float, max_skip_seconds: float):
+        self.alpha = alpha
+        self.pixel_threshold = pixel_threshold
+        self.min_activity = min_activity
+        self.max_skip_seconds = max_skip_seconds
+        self._cameras = {}  # camera_id -> dict(background, last_processed, frames, skipped, activity)
+        self._lock = threading.Lock()
+
+    def activity(self, camera_id: str, gray_img) -> float:
+        """
+        Cập nhật ảnh nền của camera và tính độ hoạt động của frame.
+
+        Args:
+            camera_id: Mã camera
+            gray_img: Ảnh xám (có thể đã giải mã ở độ phân giải thấp)
+
+        Returns:
+            float: Tỉ lệ điểm ảnh thay đổi so với nền, 1.0 với frame đầu tiên
+        """
+        small = cv2.resize(gray_img, GATE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+        with self._lock:
+            state = self._cameras.setdefault(camera_id, {
+                "background": None, "last_processed": 0.0, "frames": 0, "skipped": 0, "activity": 1.0,
+            })
+            if state["background"] is None:
+                state["background"] = small
+                score = 1.0
+            else:
+                score = float(np.mean(cv2.absdiff(small, state["background"]) > self.pixel_threshold))
+                cv2.accumulateWeighted(small, state["background"], self.alpha)
+            state["activity"] = score
+            return score
+
+    def should_process(self, camera_id: str, gray_img, force: bool = False) -> bool:
+        """
+        Quyết định có chạy nhận dạng cho frame hay không.
+
+        Args:
+            force: Luôn xử lý (ví dụ khi tracker còn theo dõi xe), nền vẫn được cập nhật
+
+        Returns:
+            bool: False nếu frame tĩnh và chưa tới hạn kiểm tra lại
+        """
+        score = self.activity(camera_id, gray_img)
+        now = time.monotonic()
+        with self._lock:
+            state = self._cameras[camera_id]
+            state["frames"] += 1
+            if force or score >= self.min_activity or now - state["last_processed"] >= self.max_skip_seconds:
+                state["last_processed"] = now
+                return True
+            state["skipped"] += 1
+            return False
+
+    def is_moving(self, camera_id: str) -> bool:
+        # Frame gần nhất của camera có thay đổi so với nền hay không
+        with self._lock:
+            state = self._cameras.get(camera_id)
+            return state is not None and state["activity"] >= self.min_activity
+
+    def reset(self, camera_id: str) -> None:
+        with self._lock:
+            self._cameras.pop(camera_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                camera_id: {
+                    "frames": state["frames"],
+                    "skipped": state["skipped"],
+                    "activity": round(state["activity"], 4),
+                }
+                for camera_id, state in self._cameras.items()
+            }
@@ -0,0 +1,122 @@
+import threading
+
+# Các nhóm ký tự OCR hay đọc nhầm lẫn nhau. Các nhóm không giao nhau nên mỗi ký tự
+# có đúng 1 đại diện trong khoá chuẩn hoá (PlateMatcher.confusion_key).
+CONFUSION_GROUPS = ("0ODQ", "8B", "1IL", "5S", "2Z", "6G", "4A", "7T")
+CONFUSABLE_COST = 1
+SUBSTITUTION_COST = 3
+INDEL_COST = 3
+
+GROUP_OF = {char: group for group in CONFUSION_GROUPS for char in group}
+
+# Biển số Việt Nam: 2 số mã tỉnh, 1 chữ cái seri (có thể thêm 1 chữ / số), 4-5 số cuối.
+# Chữ seri không dùng I, O, Q, W nên các ký tự này ở vị trí chữ được đổi về chữ gần nhất.
+TO_DIGIT = {"O": "0", "D": "0", "Q": "0", "B": "8", "I": "1", "L": "1", "S": "5", "Z": "2", "G": "6", "A": "4", "T": "7"}
+TO_LETTER = {"0": "D", "8": "B", "5": "S", "2": "Z", "6": "G", "4": "A", "7": "T", "O": "D", "Q": "D"}
+
+
+def substitution_cost(a: str, b: str) -> int:
+    if a == b:
+        return 0
+    group = GROUP_OF.get(a)
+    return CONFUSABLE_COST if group is not None and b in group else SUBSTITUTION_COST
+
+
+def plate_distance(a: str, b: str) -> int:
+    """
+    Khoảng cách chỉnh sửa có trọng số: đổi 2 ký tự dễ nhầm tốn 1, đổi ký tự khác tốn 3,
+    thêm / xoá ký tự tốn 3.
+    """
+    previous = list(range(0, (len(b) + 1) * INDEL_COST, INDEL_COST))
+    for i, char_a in enumerate(a, start=1):
+        current = [i * INDEL_COST]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + INDEL_COST,
+                current[j - 1] + INDEL_COST,
+                previous[j - 1] + substitution_cost(char_a, char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def apply_positional_rules(plate: str) -> str:
+    """
+    Sửa ký tự sai loại theo định dạng biển số Việt Nam: 2 ký tự đầu và 4-5 ký tự cuối
+    là số, ký tự thứ 3 là chữ. Chuỗi không giống biển số được trả về nguyên vẹn.
+    """
+    if not 7 <= len(plate) <= 9:
+        return plate
+    chars = list(plate)
+    tail = 5 if len(plate) >= 9 else 4
+    for i in list(range(2)) + list(range(len(chars) - tail, len(chars))):
+        chars[i] = TO_DIGIT.get(chars[i], chars[i])
+    chars[2] = TO_LETTER.get(chars[2], chars[2])
+    return "".join(chars)
+
+
+def deletion_variants(key: str) -> set[str]:
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+class PlateMatcher:
+    """
+    Tìm biển số đăng ký gần nhất với chuỗi OCR đọc được.
+
+    Mỗi biển số được lưu theo khoá chuẩn hoá nhóm ký tự dễ nhầm (0/O/D, 8/B, 1/I, 5/S...)
+    và các khoá bỏ đi 1 ký tự, nên ứng viên chỉ sai ký tự dễ nhầm, hoặc thêm 1 lần
+    đổi / thêm / xoá ký tự bất kỳ, được tìm bằng vài lần tra dict rồi tính khoảng cách
+    có trọng số. Nếu nhiều biển số cùng khoảng cách nhỏ nhất thì không chọn biển nào.
+    Chỉ mục được dựng lại ở thread nền khi phiên bản của nguồn biển số (plate_source.version) thay đổi.
+    """
+
+    def __init__(self, plate_source, max_distance: int):
+        self.plate_source = plate_source
+        # Chỉ mục chỉ bao phủ tối đa 1 lỗi không phải nhầm ký tự
+        self.max_distance = min(max_distance, 2 * SUBSTITUTION_COST - 1)
+        self._lock = threading.Lock()
+        self._version = None
+        self._by_key = {}
+
+    @staticmethod
+    def confusion_key(plate: str) -> str:
+        return "".join(GROUP_OF.get(char, char)[0] for char in plate)
+
+    def _rebuild(self):
+        with self._lock:
+            version = self.plate_source.version
+            if version == self._version:
+                return
+            by_key = {}
+            allow_edit = self.max_distance >= min(SUBSTITUTION_COST, INDEL_COST)
+            for plate in self.plate_source.plates():
+                key = self.confusion_key(plate)
+                for variant in deletion_variants(key) if allow_edit else (key,):
+                    by_key.setdefault(variant, []).append(plate)
+            self._by_key, self._version = by_key, version
+
+    def match(self, plate: str):
+        """
+        Returns:
+            tuple[str, int] | None: (biển số đăng ký, khoảng cách tới chuỗi OCR), None nếu không có
+            biển số nào đủ gần hoặc kết quả không rõ ràng
+        """
+        if self._version is None:
+            self._rebuild()
+        elif self._version != self.plate_source.version and not self._lock.locked():
+            # Dựng lại ở thread nền, trong lúc đó vẫn dùng chỉ mục cũ
+            threading.Thread(target=self._rebuild, name="plate-matcher-rebuild", daemon=True).start()
+        query = apply_positional_rules(plate)
+        key = self.confusion_key(query)
+        allow_edit = self.max_distance >= min(SUBSTITUTION_COST, INDEL_COST)
+        plates = set()
+        for variant in deletion_variants(key) if allow_edit else (key,):
+            plates.update(self._by_key.get(variant, ()))
+        candidates = [(p, plate_distance(query, p)) for p in plates]
+        candidates = sorted((c for c in candidates if c[1] <= self.max_distance), key=lambda item: item[1])
+        if not candidates:
+            return None
+        if len(candidates) > 1 and candidates[1][1] == candidates[0][1]:
+            return None
+        # Cùng khoảng cách đã dùng để lọc theo max_distance (sau khi sửa theo vị trí)
+        return candidates[0]
@@ -0,0 +1,150 @@
+import os
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from function.backends import ensure_exported, EXPORT_DIR, EXPORT_IMGSZ
+
+# Lượng tử hoá INT8 tĩnh cho model OCR (LP_ocr) bằng ONNX Runtime.
+# Ảnh hiệu chỉnh (calibration) lấy từ uploads/vehicles: cắt vùng biển số bằng
+# LP_detector rồi tiền xử lý giống hệt đường nhận dạng thật.
+CALIBRATION_DIR = "uploads/vehicles"
+
+
+def quantized_path(weights: str) -> str:
+    return os.path.join(EXPORT_DIR, Path(weights).stem + ".int8.onnx")
+
+
+def letterbox(img, size: int = EXPORT_IMGSZ):
+    h, w = img.shape[:2]
+    r = size / max(h, w)
+    resized = cv2.resize(img, (round(w * r), round(h * r)), interpolation=cv2.INTER_LINEAR)
+    out = np.full((size, size, 3), 114, dtype=np.uint8)
+    top = (size - resized.shape[0]) // 2
+    left = (size - resized.shape[1]) // 2
+    out[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+    return out
+
+
+def to_input_tensor(img):
+    # BGR HWC uint8 -> RGB NCHW float32 [0, 1], giống AutoShape của yolov5
+    x = letterbox(img)[:, :, ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(x[None], dtype=np.float32) / 255.0
+
+
+def calibration_crops(image_dir: str = CALIBRATION_DIR):
+    """
+    Lấy các ảnh biển số đã tiền xử lý từ thư mục ảnh xe để hiệu chỉnh / đánh giá.
+
+    Returns:
+        list: Ảnh BGR của từng biển số (cả ảnh nếu không phát hiện được biển số)
+    """
+    from function.detect import preprocess_image
+    from function.model_registry import ModelRegistry, MODEL_PATHS
+
+    detector = ModelRegistry(MODEL_PATHS, "pytorch").get("detector")
+    crops = []
+    for image_path in sorted(Path(image_dir).iterdir()):
+        img = cv2.imread(str(image_path))
+        if img is None:
+            continue
+        boxes = detector(img, size=640).xyxy[0].cpu().numpy()
+        if len(boxes) == 0:
+            crops.append(img)
+        for x1, y1, x2, y2 in boxes[:, :4].astype(int):
+            crops.append(preprocess_image(img[y1:y2, x1:x2]))
+    return crops
+
+
+def ensure_quantized(weights: str) -> str:
+    """
+    Trả về đường dẫn model OCR INT8, lượng tử hoá nếu chưa có hoặc weights gốc mới hơn.
+
+    Args:
+        weights: Đường dẫn file .pt gốc của model OCR
+
+    Returns:
+        str: Đường dẫn file .int8.onnx
+    """
+    target = quantized_path(weights)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(weights):
+        return target
+
+    import onnxruntime
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    fp32_path = ensure_exported(weights, "onnx")
+    input_name = onnxruntime.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class PlateCalibrationReader(CalibrationDataReader):
+        def __init__(self, crops):
+            self._inputs = iter([{input_name: to_input_tensor(crop)} for crop in crops])
+
+        def get_next(self):
+            return next(self._inputs, None)
+
+    print(f"Quantizing {fp32_path} to INT8...")
+    quantize_static(
+        fp32_path,
+        target,
+        PlateCalibrationReader(calibration_crops()),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    return target
+
+
+def compare_report(weights: str = "model/LP_ocr.pt", repeats: int = 5) -> str:
+    """
+    So sánh độ chính xác và độ trễ của model OCR FP32 với INT8 trên ảnh hiệu chỉnh.
+
+    Độ chính xác được tính là tỉ lệ biển số INT8 đọc giống FP32.
+
+    Returns:
+        str: Báo cáo dạng markdown
+    """
+    import torch
+    from function import helper
+
+    crops = calibration_crops()
+    models = {
+        "FP32 (PyTorch)": torch.hub.load('yolov5', 'custom', path=weights, source='local'),
+        "INT8 (ONNX Runtime)": torch.hub.load('yolov5', 'custom', path=ensure_quantized(weights), source='local'),
+    }
+    readings = {}
+    latencies = {}
+    for label, model in models.items():
+        model.conf = 0.60
+        helper.read_plate(model, crops[0])  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            readings[label] = [helper.read_plate(model, crop) for crop in crops]
+        latencies[label] = (time.perf_counter() - start) * 1000 / (repeats * len(crops))
+
+    fp32, int8 = readings.values()
+    agreement = sum(a == b for a, b in zip(fp32, int8)) / len(crops)
+    lines = [
+        "# LP_ocr FP32 vs INT8",
+        "",
+        f"Crops: {len(crops)} from {CALIBRATION_DIR}, {repeats} runs each",
+        "",
+        "| Model | ms / call | Readings |",
+        "|---|---|---|",
+    ]
+    for label in models:
+        lines.append(f"| {label} | {latencies[label]:.1f} | {', '.join(readings[label])} |")
+    lines += ["", f"INT8 readings identical to FP32: {agreement:.0%}"]
+    lines.append(f"Speed-up: {latencies['FP32 (PyTorch)'] / latencies['INT8 (ONNX Runtime)']:.2f}x")
+    return "\n".join(lines)
+
+
+# Tạo báo cáo: python -m function.quantize
+if __name__ == "__main__":
+    report = compare_report()
+    report_path = "model/LP_ocr_int8_report.md"
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+    print(report)
+    print(f"\nReport written to {report_path}")
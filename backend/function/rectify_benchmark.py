@@ -0,0 +1,72 @@
+import time
+from pathlib import Path
+import cv2
+from app.core.config import settings
+from function import detect
+
+# So sánh 2 chế độ nắn biển số (deskew 2x2 và perspective) trên ảnh mẫu.
+# Tên file ảnh là biển số thật (ví dụ uploads/vehicles/29T82843.jpg) nên dùng làm đáp án.
+MODES = ("deskew", "perspective")
+
+
+def run_benchmark(image_dir: str = "uploads/vehicles") -> str:
+    """
+    Đo độ chính xác, số lần OCR trung bình và thời gian đọc mỗi biển số cho từng chế độ.
+
+    Returns:
+        str: Bảng kết quả dạng markdown
+    """
+    samples = []
+    for image_path in sorted(Path(image_dir).iterdir()):
+        img = cv2.imread(str(image_path))
+        if img is None:
+            continue
+        plates = detect.detect_batcher.run(img)
+        if plates:
+            samples.append((image_path.stem, img, plates))
+
+    if samples:
+        detect.run_ocr([samples[0][1]])  # warm-up để lần load model OCR không bị tính vào chế độ đầu tiên
+
+    ocr_images = 0
+    original_run_ocr = detect.run_ocr
+
+    def counting_run_ocr(ims):
+        nonlocal ocr_images
+        ocr_images += len(ims)
+        return original_run_ocr(ims)
+
+    original_mode = settings.PLATE_RECTIFY_MODE
+    detect.run_ocr = counting_run_ocr
+    rows = []
+    try:
+        for mode in MODES:
+            settings.PLATE_RECTIFY_MODE = mode
+            ocr_images = 0
+            correct = 0
+            plate_count = 0
+            start = time.perf_counter()
+            for expected, img, plates in samples:
+                readings = detect.read_plate_crops(img, plates)
+                plate_count += len(plates)
+                correct += any(reading.text == expected for reading in readings)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            rows.append((mode, correct, ocr_images / max(plate_count, 1), elapsed_ms / max(plate_count, 1)))
+    finally:
+        detect.run_ocr = original_run_ocr
+        settings.PLATE_RECTIFY_MODE = original_mode
+
+    lines = [
+        f"Images with detected plates: {len(samples)}",
+        "",
+        "| Mode | Correct images | OCR calls / plate | ms / plate |",
+        "|---|---|---|---|",
+    ]
+    for mode, correct, calls, ms in rows:
+        lines.append(f"| {mode} | {correct}/{len(samples)} | {calls:.2f} | {ms:.1f} |")
+    return "\n".join(lines)
+
+
+# Chạy benchmark: python -m function.rectify_benchmark
+if __name__ == "__main__":
+    print(run_benchmark())
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+
+def exact_key(image_bytes) -> bytes:
+    return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+
+def perceptual_hash(gray_img) -> int:
+    # dHash 64 bit: so sánh độ sáng các điểm ảnh liền kề trên ảnh thu nhỏ 9x8
+    small = cv2.resize(gray_img, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+class ResultCache:
+    """
+    Cache kết quả nhận dạng theo camera cho các frame giống hệt hoặc gần giống nhau.
+
+    Tra cứu theo 2 mức: hash chính xác của bytes ảnh upload, rồi hash cảm nhận (dHash)
+    với khoảng cách Hamming <= max_hamming. Hash cảm nhận của cả khung hình gần như không
+    đổi khi xe chiếm 1 phần nhỏ ảnh, nên mức này chỉ trả về kết quả có biển số: kết quả
+    "làn trống" không bao giờ được dùng lại cho frame khác. Mỗi mục hết hạn sau
+    ttl_seconds và bị loại theo LRU khi vượt quá max_entries.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_hamming: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_hamming = max_hamming
+        self._entries = OrderedDict()  # (camera_id, digest) -> (phash, expires_at, results)
+        self._lock = threading.Lock()
+        self._exact_hits = 0
+        self._perceptual_hits = 0
+        self._misses = 0
+
+    def lookup_exact(self, camera_id: str, digest: bytes):
+        with self._lock:
+            entry = self._entries.get((camera_id, digest))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            self._entries.move_to_end((camera_id, digest))
+            self._exact_hits += 1
+            return list(entry[2])
+
+    def lookup_similar(self, camera_id: str, phash: int):
+        with self._lock:
+            now = time.monotonic()
+            for key in reversed(self._entries):
+                entry_phash, expires_at, results = self._entries[key]
+                if key[0] != camera_id or expires_at < now or not results:
+                    continue
+                if (entry_phash ^ phash).bit_count() <= self.max_hamming:
+                    self._entries.move_to_end(key)
+                    self._perceptual_hits += 1
+                    return list(results)
+            self._misses += 1
+            return None
+
+    def count_miss(self) -> None:
+        # Frame không tra cứu hash cảm nhận (có chuyển động) vẫn tính là trượt cache
+        with self._lock:
+            self._misses += 1
+
+    def store(self, camera_id: str, digest: bytes, phash: int, results: list) -> None:
+        with self._lock:
+            key = (camera_id, digest)
+            self._entries[key] = (phash, time.monotonic() + self.ttl_seconds, list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._exact_hits + self._perceptual_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self._exact_hits,
+                "perceptual_hits": self._perceptual_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._exact_hits + self._perceptual_hits) / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+import cv2
+
+
+class VideoStream:
+    """
+    Đọc video liên tục từ 1 camera (file hoặc RTSP) và đưa frame vào pipeline nhận dạng.
+
+    Thread đọc chỉ grab() liên tục để luôn giữ frame mới nhất; frame chỉ được
+    giải mã (retrieve) khi thread xử lý cần, các frame cũ bị bỏ qua khi xử lý chậm.
+    Tốc độ lấy mẫu thích ứng: target_fps khi vừa thấy biển số, giảm dần về
+    idle_fps khi không có xe, và không bao giờ nhanh hơn thời gian xử lý 1 frame.
+    """
+
+    def __init__(self, camera_id: str, source: str, process_frame, on_results,
+                 target_fps: float, idle_fps: float, plate_cooldown: float, reconnect_delay: float,
+                 tracker=None):
+        self.camera_id = camera_id
+        self.source = source
+        self.process_frame = process_frame
+        self.on_results = on_results
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.plate_cooldown = plate_cooldown
+        self.reconnect_delay = reconnect_delay
+        self.tracker = tracker
+        self.is_file = os.path.exists(source)
+
+        self._stop = threading.Event()
+        self._want_frame = threading.Event()
+        self._frame_ready = threading.Condition()
+        self._frame = None
+        self._reader = threading.Thread(target=self._read_loop, name=f"stream-reader-{camera_id}", daemon=True)
+        self._worker = threading.Thread(target=self._process_loop, name=f"stream-worker-{camera_id}", daemon=True)
+
+        self._interval = 1 / target_fps
+        self._processing_time = 0.0
+        self._last_seen = {}
+        self.frames_read = 0
+        self.frames_processed = 0
+        self.last_error = None
+        self.finished = False
+
+    def start(self):
+        self._reader.start()
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        self._reader.join(timeout=5)
+        self._worker.join(timeout=5)
+
+    def is_running(self) -> bool:
+        return self._reader.is_alive() or self._worker.is_alive()
+
+    def status(self) -> dict:
+        return {
+            "camera_id": self.camera_id,
+            "source": self.source,
+            "running": self.is_running(),
+            "finished": self.finished,
+            "frames_read": self.frames_read,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_read - self.frames_processed,
+            "sampling_fps": round(1 / self._interval, 2),
+            "processing_ms": round(self._processing_time * 1000, 1),
+            "active_tracks": self.tracker.active_tracks if self.tracker is not None else 0,
+            "last_error": self.last_error,
+        }
+
+    def _read_loop(self):
+        while not self._stop.is_set():
+            cap = cv2.VideoCapture(self.source)
+            if not cap.isOpened():
+                self.last_error = f"Cannot open video source '{self.source}'"
+                if self.is_file or self._stop.wait(self.reconnect_delay):
+                    break
+                continue
+            # File video được đọc theo đúng FPS gốc để giả lập camera thật
+            frame_delay = 1 / (cap.get(cv2.CAP_PROP_FPS) or 25) if self.is_file else 0
+            while not self._stop.is_set():
+                started = time.monotonic()
+                if not cap.grab():
+                    break
+                self.frames_read += 1
+                if self._want_frame.is_set():
+                    ok, frame = cap.retrieve()
+                    if ok:
+                        self._want_frame.clear()
+                        with self._frame_ready:
+                            self._frame = frame
+                            self._frame_ready.notify()
+                if frame_delay:
+                    self._stop.wait(max(0.0, frame_delay - (time.monotonic() - started)))
+            cap.release()
+            if self.is_file:
+                break
+            self.last_error = f"Lost video source '{self.source}', reconnecting"
+            self._stop.wait(self.reconnect_delay)
+        self.finished = True
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+
+    def _next_frame(self):
+        self._want_frame.set()
+        with self._frame_ready:
+            while self._frame is None and not self._stop.is_set() and not self.finished:
+                self._frame_ready.wait(timeout=1)
+            frame, self._frame = self._frame, None
+        return frame
+
+    def _process_loop(self):
+        while not self._stop.is_set():
+            frame = self._next_frame()
+            if frame is None:
+                break
+            started = time.monotonic()
+            try:
+                results = self.process_frame(frame, self.tracker, self.camera_id)
+            except Exception as e:
+                self.last_error = str(e)
+                results = []
+            self._processing_time = time.monotonic() - started
+            self.frames_processed += 1
+
+            # Thấy biển số thì lấy mẫu nhanh, không có xe thì giãn dần về idle_fps
+            if results or (self.tracker is not None and self.tracker.active_tracks):
+                self._interval = 1 / self.target_fps
+            else:
+                self._interval = min(self._interval * 1.5, 1 / self.idle_fps)
+            self._interval = max(self._interval, self._processing_time)
+
+            fresh = self._filter_recent(results)
+            if fresh:
+                try:
+                    self.on_results(self.camera_id, fresh)
+                except Exception as e:
+                    self.last_error = str(e)
+            self._stop.wait(max(0.0, self._interval - self._processing_time))
+
+    def _filter_recent(self, results):
+        # Xe đứng trước barie xuất hiện ở nhiều frame liên tiếp: chỉ báo 1 lần mỗi plate_cooldown giây
+        now = time.monotonic()
+        if len(self._last_seen) > 1000:
+            self._last_seen = {plate: t for plate, t in self._last_seen.items() if now - t <= self.plate_cooldown}
+        fresh = []
+        for plate_data in results:
+            last_seen = self._last_seen.get(plate_data["plate"])
+            self._last_seen[plate_data["plate"]] = now
+            if last_seen is None or now - last_seen > self.plate_cooldown:
+                fresh.append(plate_data)
+        return fresh
+
+
+class StreamManager:
+    def __init__(self):
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def start_stream(self, camera_id: str, source: str, process_frame, on_results, **options) -> VideoStream:
+        """
+        Bắt đầu đọc stream cho camera.
+
+        Raises:
+            ValueError: Nếu camera đang có stream chạy
+        """
+        with self._lock:
+            current = self._streams.get(camera_id)
+            if current is not None and current.is_running():
+                raise ValueError(f"Camera '{camera_id}' is already streaming")
+            stream = VideoStream(camera_id, source, process_frame, on_results, **options)
+            self._streams[camera_id] = stream
+        stream.start()
+        return stream
+
+    def stop_stream(self, camera_id: str) -> None:
+        """
+        Dừng stream của camera.
+
+        Raises:
+            ValueError: Nếu camera không có stream
+        """
+        with self._lock:
+            stream = self._streams.pop(camera_id, None)
+        if stream is None:
+            raise ValueError("Stream not found")
+        stream.stop()
+
+    def stop_all(self) -> None:
+        with self._lock:
+            streams = list(self._streams.values())
+            self._streams.clear()
+        for stream in streams:
+            stream.stop()
+
+    def list_streams(self) -> list[dict]:
+        with self._lock:
+            return [stream.status() for stream in self._streams.values()]
+
+
+stream_manager = StreamManager()
@@ -0,0 +1,127 @@
+import itertools
+import numpy as np
+
+
+def box_iou(boxes_a, boxes_b):
+    # IoU giữa từng cặp box (x1, y1, x2, y2) của 2 mảng, kết quả shape (len(a), len(b))
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class Track:
+    def __init__(self, track_id: int, box):
+        self.id = track_id
+        self.box = box
+        self.missed = 0
+        self.ocr_count = 0
+        self.votes = {}
+        self.counts = {}
+        self.reported = False
+
+    def best(self):
+        if not self.votes:
+            return None, 0.0
+        return max(self.votes.items(), key=lambda item: item[1])
+
+
+class PlateTracker:
+    """
+    Theo dõi biển số qua các frame liên tiếp của 1 camera bằng IoU giữa các box.
+
+    Mỗi track chỉ được OCR cho tới khi đủ phiếu (confirm_votes) hoặc hết lượt
+    (max_ocr_per_track); kết quả cuối là chuỗi có tổng độ tin cậy cao nhất.
+    Mỗi xe chỉ được báo 1 lần, khi track được xác nhận hoặc khi xe rời khung hình.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_missed: int = 10,
+                 confirm_votes: float = 3.0, max_ocr_per_track: int = 10):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.confirm_votes = confirm_votes
+        self.max_ocr_per_track = max_ocr_per_track
+        self.tracks = []
+        self._finished = []
+        self._ids = itertools.count(1)
+
+    def update(self, boxes) -> list[Track]:
+        """
+        Gán các box của frame hiện tại vào track (tạo track mới nếu cần).
+
+        Returns:
+            list[Track]: Track tương ứng với từng box, cùng thứ tự với boxes
+        """
+        boxes = [list(map(float, box[:4])) for box in boxes]
+        assigned = [None] * len(boxes)
+        matched_tracks = set()
+        if boxes and self.tracks:
+            iou = box_iou([track.box for track in self.tracks], boxes)
+            # Ghép tham lam theo IoU giảm dần
+            for t, b in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+                if iou[t, b] < self.iou_threshold:
+                    break
+                if t in matched_tracks or assigned[b] is not None:
+                    continue
+                matched_tracks.add(t)
+                assigned[b] = self.tracks[t]
+
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.missed += 1
+        for b, box in enumerate(boxes):
+            if assigned[b] is None:
+                assigned[b] = Track(next(self._ids), box)
+                self.tracks.append(assigned[b])
+            else:
+                assigned[b].box = box
+                assigned[b].missed = 0
+
+        alive = []
+        for track in self.tracks:
+            (alive if track.missed <= self.max_missed else self._finished).append(track)
+        self.tracks = alive
+        return assigned
+
+    def is_confirmed(self, track: Track) -> bool:
+        return track.best()[1] >= self.confirm_votes
+
+    def needs_ocr(self, track: Track) -> bool:
+        return not self.is_confirmed(track) and track.ocr_count < self.max_ocr_per_track
+
+    def add_reading(self, track: Track, plate, confidence: float = 1.0) -> None:
+        track.ocr_count += 1
+        if plate:
+            track.votes[plate] = track.votes.get(plate, 0.0) + confidence
+            track.counts[plate] = track.counts.get(plate, 0) + 1
+
+    def pop_confirmed(self) -> list[tuple[str, float]]:
+        """
+        Lấy biển số của các xe chưa được báo: track đã xác nhận, đã hết lượt OCR,
+        hoặc vừa rời khung hình mà có ít nhất 1 lần đọc được.
+
+        Returns:
+            list[tuple[str, float]]: (biển số, độ tin cậy trung bình của các lần đọc ra biển số đó)
+        """
+        plates = []
+        candidates = [(track, False) for track in self.tracks] + [(track, True) for track in self._finished]
+        for track, finished in candidates:
+            if track.reported or not track.votes:
+                continue
+            if finished or not self.needs_ocr(track):
+                track.reported = True
+                plate, score = track.best()
+                plates.append((plate, score / track.counts[plate]))
+        self._finished = []
+        return plates
+
+    @property
+    def active_tracks(self) -> int:
+        return len(self.tracks)
@@ -1,12 +1,23 @@
 import numpy as np
 import math
 import cv2
+import threading
+
+# CLAHE của OpenCV không an toàn khi dùng chung giữa các thread: mỗi thread giữ 1 bản
+_local = threading.local()
+
+def get_clahe(clip_limit):
+    cache = getattr(_local, "clahe", None)
+    if cache is None:
+        cache = _local.clahe = {}
+    if clip_limit not in cache:
+        cache[clip_limit] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+    return cache[clip_limit]
 
 def changeContrast(img):
     lab= cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
     l_channel, a, b = cv2.split(lab)
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    cl = clahe.apply(l_channel)
+    cl = get_clahe(3.0).apply(l_channel)
     limg = cv2.merge((cl,a,b))
     enhanced_img = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
     return enhanced_img
@@ -17,7 +28,7 @@ def rotate_image(image, angle):
     result = cv2.warpAffine(image, rot_mat, image.shape[1::-1], flags=cv2.INTER_LINEAR)
     return result
 
-def compute_skew(src_img, center_thres):
+def hough_lines(src_img):
     if len(src_img.shape) == 3:
         h, w, _ = src_img.shape
     elif len(src_img.shape) == 2:
@@ -26,33 +37,30 @@ def compute_skew(src_img, center_thres):
         print('upsupported image type')
     img = cv2.medianBlur(src_img, 3)
     edges = cv2.Canny(img,  threshold1 = 30,  threshold2 = 100, apertureSize = 3, L2gradient = True)
-    lines = cv2.HoughLinesP(edges, 1, math.pi/180, 30, minLineLength=w / 1.5, maxLineGap=h/3.0)
+    return cv2.HoughLinesP(edges, 1, math.pi/180, 30, minLineLength=w / 1.5, maxLineGap=h/3.0)
+
+def skew_from_lines(lines, center_thres):
     if lines is None:
         return 1
 
-    min_line = 100
+    # chọn đường cao nhất (tâm có y nhỏ nhất, < 100), bỏ các đường sát mép trên nếu center_thres == 1
+    segments = lines.reshape(-1, 4)
+    center_y = (segments[:, 1] + segments[:, 3]) / 2
+    candidates = center_y < 100
+    if center_thres == 1:
+        candidates &= center_y >= 7
     min_line_pos = 0
-    for i in range (len(lines)):
-        for x1, y1, x2, y2 in lines[i]:
-            center_point = [((x1+x2)/2), ((y1+y2)/2)]
-            if center_thres == 1:
-                if center_point[1] < 7:
-                    continue
-            if center_point[1] < min_line:
-                min_line = center_point[1]
-                min_line_pos = i
-
-    angle = 0.0
-    nlines = lines.size
-    cnt = 0
-    for x1, y1, x2, y2 in lines[min_line_pos]:
-        ang = np.arctan2(y2 - y1, x2 - x1)
-        if math.fabs(ang) <= 30: # excluding extreme rotations
-            angle += ang
-            cnt += 1
-    if cnt == 0:
+    if candidates.any():
+        min_line_pos = int(np.flatnonzero(candidates)[np.argmin(center_y[candidates])])
+
+    angles = np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0])
+    ang = angles[min_line_pos]
+    if math.fabs(ang) > 30: # excluding extreme rotations
         return 0.0
-    return (angle / cnt)*180/math.pi
+    return ang*180/math.pi
+
+def compute_skew(src_img, center_thres):
+    return skew_from_lines(hough_lines(src_img), center_thres)
 
 def deskew(src_img, change_cons, center_thres):
     if change_cons == 1:
@@ -60,3 +68,54 @@ def deskew(src_img, change_cons, center_thres):
     else:
         return rotate_image(src_img, compute_skew(src_img, center_thres))
 
+def deskew_variants(src_img):
+    # 4 biến thể theo thứ tự (change_cons, center_thres) = (0,0), (0,1), (1,0), (1,1) như deskew();
+    # changeContrast và Hough chỉ tính 1 lần cho mỗi chế độ tương phản, góc trùng thì dùng lại ảnh đã xoay
+    variants = []
+    rotated = {}
+    for contrast_img in (src_img, changeContrast(src_img)):
+        lines = hough_lines(contrast_img)
+        for center_thres in range(2):
+            angle = skew_from_lines(lines, center_thres)
+            if angle not in rotated:
+                rotated[angle] = rotate_image(src_img, angle)
+            variants.append(rotated[angle])
+    return variants
+
+def order_corners(pts):
+    # sắp xếp 4 góc theo thứ tự: trên-trái, trên-phải, dưới-phải, dưới-trái
+    pts = np.asarray(pts, dtype=np.float32).reshape(4, 2)
+    s = pts.sum(axis=1)
+    d = np.diff(pts, axis=1).ravel()
+    return np.array([pts[np.argmin(s)], pts[np.argmin(d)], pts[np.argmax(s)], pts[np.argmax(d)]], dtype=np.float32)
+
+def find_plate_quad(src_img, min_area_ratio=0.3):
+    # Tìm tứ giác biển số: vùng sáng lớn nhất sau khi nhị phân Otsu
+    gray = cv2.cvtColor(src_img, cv2.COLOR_BGR2GRAY) if len(src_img.shape) == 3 else src_img
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    contour = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(contour) < min_area_ratio * gray.shape[0] * gray.shape[1]:
+        return None
+    approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+    if len(approx) == 4 and cv2.isContourConvex(approx):
+        return order_corners(approx)
+    return order_corners(cv2.boxPoints(cv2.minAreaRect(contour)))
+
+def rectify(src_img):
+    # Nắn phẳng biển số bằng 1 phép biến đổi phối cảnh, trả về ảnh gốc nếu không tìm được tứ giác
+    quad = find_plate_quad(src_img)
+    if quad is None:
+        return src_img
+    tl, tr, br, bl = quad
+    width = int(round(max(np.linalg.norm(tr - tl), np.linalg.norm(br - bl))))
+    height = int(round(max(np.linalg.norm(bl - tl), np.linalg.norm(br - tr))))
+    if width < 10 or height < 10:
+        return src_img
+    dst = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(quad, dst)
+    return cv2.warpPerspective(src_img, matrix, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
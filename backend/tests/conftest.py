@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+# Phải đặt trước khi import app: Settings đọc DATABASE_URL lúc import. Luôn dùng database
+# SQLite tạm, không bao giờ chạy test trên DATABASE_URL thật trong .env
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["MODEL_WARMUP_ON_STARTUP"] = "false"
+
+import pytest
+from sqlalchemy import event
+from app.db.session import Base, SessionLocal, engine
+import app.models  # noqa: F401  (đăng ký các bảng vào Base.metadata)
+import app.models.user  # noqa: F401
+
+
+# SQLite mặc định không kiểm tra khoá ngoại; bật lên để test giống PostgreSQL
+# (ví dụ lượt gửi xe của biển số chưa đăng ký phải bị từ chối)
+@event.listens_for(engine, "connect")
+def enable_foreign_keys(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,25 @@
+import os
+from pathlib import Path
+import pytest
+from function.backends import BACKENDS, check_parity
+from function.model_registry import MODEL_PATHS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_DIR = BACKEND_DIR / "uploads" / "vehicles"
+
+
+@pytest.mark.parametrize("backend", [backend for backend in BACKENDS if backend != "pytorch"])
+def test_exported_backend_matches_pytorch(backend, monkeypatch):
+    # Cần weights gốc, repo yolov5 (export.py, torch.hub local) và ảnh mẫu; thiếu thì bỏ qua
+    missing = [path for path in (*MODEL_PATHS.values(), "yolov5") if not (BACKEND_DIR / path).exists()]
+    if missing:
+        pytest.skip(f"Thiếu {', '.join(missing)}")
+    if not SAMPLE_DIR.is_dir() or not any(SAMPLE_DIR.iterdir()):
+        pytest.skip(f"Không có ảnh mẫu trong {SAMPLE_DIR}")
+    pytest.importorskip("torch")
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+
+    # check_parity và MODEL_PATHS dùng đường dẫn tương đối so với thư mục backend
+    monkeypatch.chdir(BACKEND_DIR)
+    assert check_parity(backend, image_dir=os.fspath(SAMPLE_DIR))
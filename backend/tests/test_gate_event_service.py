@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.parking_lot import ParkingLot
+from app.models.registered_vehicle import RegisteredVehicle
+from app.services.gate_event_service import GateEventService
+
+TOGGLES = [GateEventService.toggle_plates, GateEventService._toggle_each]
+
+
+@pytest.fixture
+def plates(db):
+    for plate in ("30A12345", "51G67890"):
+        db.add(RegisteredVehicle(license_plate=plate, owner_name="Owner", phone_number="0900000000"))
+    db.commit()
+    return db
+
+
+def sessions(db, plate):
+    db.expire_all()
+    return db.query(ParkingLot).filter(ParkingLot.license_plate == plate).order_by(ParkingLot.id).all()
+
+
+def park_since(db, plate, minutes):
+    db.add(ParkingLot(license_plate=plate, entry_time=datetime.utcnow() - timedelta(minutes=minutes)))
+    db.commit()
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_first_observation_opens_a_session(plates, toggle):
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "entry"}
+    (session,) = sessions(plates, "30A12345")
+    assert session.exit_time is None
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_observation_of_parked_car_closes_its_session(plates, toggle):
+    park_since(plates, "30A12345", minutes=30)
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "exit"}
+    (session,) = sessions(plates, "30A12345")
+    assert session.exit_time is not None
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_repeated_entry_within_dedup_window_is_the_same_entry(plates, toggle):
+    toggle(plates, ["30A12345"])
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "entry"}
+    (session,) = sessions(plates, "30A12345")
+    assert session.exit_time is None
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_repeated_exit_within_dedup_window_does_not_reopen(plates, toggle):
+    park_since(plates, "30A12345", minutes=30)
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "exit"}
+    # Lần ghi nhận thứ 2 (ví dụ camera khác) ngay sau đó: không được mở lượt gửi mới
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "exit"}
+    (session,) = sessions(plates, "30A12345")
+    assert session.exit_time is not None
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_new_entry_after_dedup_window(plates, toggle, monkeypatch):
+    park_since(plates, "30A12345", minutes=30)
+    toggle(plates, ["30A12345"])
+    monkeypatch.setattr("app.services.gate_event_service.settings.GATE_DEDUP_SECONDS", 0)
+    assert toggle(plates, ["30A12345"]) == {"30A12345": "entry"}
+    assert [session.exit_time is None for session in sessions(plates, "30A12345")] == [False, True]
+
+
+def test_mixed_batch_and_duplicate_plates(plates):
+    park_since(plates, "51G67890", minutes=30)
+    result = GateEventService.toggle_plates(plates, ["30A12345", "51G67890", "30A12345"])
+    assert result == {"30A12345": "entry", "51G67890": "exit"}
+    assert len(sessions(plates, "30A12345")) == 1
+
+
+def test_process_detection_results_marks_operations(plates):
+    results = [
+        {"plate": "30-A1 2345", "valid": True},  # Dạng format_license_plate trả về
+        {"plate": "unknown", "valid": False},
+    ]
+    response = GateEventService.process_detection_results(plates, results, "cam-1")
+    assert [item["operation"] for item in response] == ["entry", "invalid"]
+    assert "operation" not in results[0]
+    (session,) = sessions(plates, "30A12345")
+    assert session.exit_time is None
+
+
+@pytest.mark.parametrize("dialect, expected", [("postgresql", True), ("sqlite", True), ("mssql", False)])
+def test_open_session_unique_index_only_on_dialects_with_partial_indexes(dialect, expected):
+    from sqlalchemy import create_mock_engine
+
+    statements = []
+    engine = create_mock_engine(f"{dialect}://", lambda sql, *args, **kwargs: statements.append(
+        str(sql.compile(dialect=engine.dialect))))
+    ParkingLot.__table__.create(engine, checkfirst=False)
+    assert any("uq_parking_lot_open_session" in statement for statement in statements) is expected
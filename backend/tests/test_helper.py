@@ -0,0 +1,125 @@
+import random
+import pytest
+from function.helper import UNKNOWN_READING, check_point_linear, decode_plate_scored
+
+NAMES = [str(i) for i in range(10)] + list("ABCDEFGHKLMNPSTUVXYZ")
+
+
+def baseline_decode_plate(bb_list):
+    # Thuật toán cũ (duyệt từng dòng results.pandas().xyxy), giữ nguyên để so kết quả
+    LP_type = "1"
+    if len(bb_list) == 0 or len(bb_list) < 7 or len(bb_list) > 10:
+        return "unknown"
+    center_list = []
+    y_sum = 0
+    for bb in bb_list:
+        x_c = (bb[0]+bb[2])/2
+        y_c = (bb[1]+bb[3])/2
+        y_sum += y_c
+        center_list.append([x_c,y_c,bb[-1]])
+
+    l_point = center_list[0]
+    r_point = center_list[0]
+    for cp in center_list:
+        if cp[0] < l_point[0]:
+            l_point = cp
+        if cp[0] > r_point[0]:
+            r_point = cp
+    for ct in center_list:
+        if l_point[0] != r_point[0]:
+            if (check_point_linear(ct[0], ct[1], l_point[0], l_point[1], r_point[0], r_point[1]) == False):
+                LP_type = "2"
+
+    y_mean = int(int(y_sum) / len(bb_list))
+
+    line_1 = []
+    line_2 = []
+    license_plate = ""
+    if LP_type == "2":
+        for c in center_list:
+            if int(c[1]) > y_mean:
+                line_2.append(c)
+            else:
+                line_1.append(c)
+        for l1 in sorted(line_1, key = lambda x: x[0]):
+            license_plate += str(l1[2])
+        for l2 in sorted(line_2, key = lambda x: x[0]):
+            license_plate += str(l2[2])
+    else:
+        for l in sorted(center_list, key = lambda x: x[0]):
+            license_plate += str(l[2])
+    return license_plate
+
+
+def box(x_c, y_c, cls, conf=0.9, w=10, h=20):
+    return [x_c - w / 2, y_c - h / 2, x_c + w / 2, y_c + h / 2, conf, cls]
+
+
+def assert_matches_baseline(boxes):
+    baseline = baseline_decode_plate([row + [NAMES[row[5]]] for row in boxes])
+    assert decode_plate_scored(boxes, NAMES).text == baseline
+    return baseline
+
+
+def test_one_line_plate():
+    boxes = [box(10 + 12 * i, 20 + 0.1 * i, cls) for i, cls in enumerate([3, 0, 10, 1, 2, 3, 4, 5])]
+    random.Random(0).shuffle(boxes)
+    assert assert_matches_baseline(boxes) == "30A12345"
+
+
+def test_two_line_plate():
+    top = [box(10 + 12 * i, 10, cls) for i, cls in enumerate([5, 1, 16, 1])]
+    bottom = [box(10 + 12 * i, 40, cls) for i, cls in enumerate([6, 7, 8, 9, 0])]
+    boxes = bottom + top
+    assert assert_matches_baseline(boxes) == "51G167890"
+
+
+def test_tied_x_keeps_input_order():
+    # 2 ký tự cùng tâm x: cả 2 thuật toán giữ thứ tự đầu vào (sắp xếp ổn định)
+    boxes = [box(10 + 12 * i, 20, cls) for i, cls in enumerate([3, 0, 10, 1, 2, 3, 4])]
+    boxes.append(box(10 + 12 * 3, 20, 9))
+    assert assert_matches_baseline(boxes) == "30A19234"
+
+
+def test_tied_x_on_two_line_plate():
+    top = [box(10 + 12 * i, 10, cls) for i, cls in enumerate([2, 9, 11, 1])]
+    bottom = [box(10 + 12 * i, 40, cls) for i, cls in enumerate([1, 2, 3, 4])]
+    assert assert_matches_baseline(top + bottom) == "29B11234"
+
+
+@pytest.mark.parametrize("offset", [3.0, 3.01])
+def test_line_tolerance_boundary(offset):
+    boxes = [box(10 + 12 * i, 20, cls) for i, cls in enumerate([3, 0, 10, 1, 2, 3, 4, 5])]
+    boxes[3] = box(10 + 12 * 3, 20 + offset, 1)
+    assert_matches_baseline(boxes)
+
+
+@pytest.mark.parametrize("count", [0, 6, 11])
+def test_wrong_box_count_is_unknown(count):
+    boxes = [box(10 + 12 * i, 20, i % 10) for i in range(count)]
+    assert decode_plate_scored(boxes, NAMES) == UNKNOWN_READING
+    assert baseline_decode_plate([row + [NAMES[row[5]]] for row in boxes]) == "unknown"
+
+
+def test_random_layouts_match_baseline():
+    rng = random.Random(42)
+    for _ in range(500):
+        count = rng.randint(7, 10)
+        two_lines = rng.random() < 0.5
+        boxes = []
+        for i in range(count):
+            row = int(two_lines and i >= count // 2)
+            column = i - row * (count // 2)
+            x_c = round(8 + 11 * column + rng.uniform(-2, 2), rng.choice([0, 1, 3]))
+            y_c = 15 + 28 * row + rng.uniform(-4, 4)
+            boxes.append(box(x_c, y_c, rng.randrange(len(NAMES)), conf=rng.random()))
+        rng.shuffle(boxes)
+        assert_matches_baseline(boxes)
+
+
+def test_confidence_is_mean_of_characters_in_reading_order():
+    boxes = [box(10 + 12 * i, 20, cls, conf=conf)
+             for i, (cls, conf) in enumerate(zip([3, 0, 10, 1, 2, 3, 4], [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.4]))]
+    reading = decode_plate_scored(list(reversed(boxes)), NAMES)
+    assert reading.char_confidences == [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.4]
+    assert reading.confidence == pytest.approx(sum(reading.char_confidences) / 7)
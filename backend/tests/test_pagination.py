@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import datetime
+import pytest
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor, page_size, split_page
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def test_cursor_round_trip():
+    entry_time = datetime(2024, 5, 1, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(entry_time, 42), datetime, int) == [entry_time, 42]
+    assert decode_cursor(encode_cursor("30A12345"), str) == ["30A12345"]
+
+
+@pytest.mark.parametrize("cursor, types", [
+    ("not-base64!", (int,)),
+    (base64.urlsafe_b64encode(b"not json").decode(), (int,)),
+    (raw_cursor({"id": 1}), (int,)),
+    (raw_cursor([1, 2]), (int,)),
+    (raw_cursor([1, 2]), (datetime, int)),
+    (raw_cursor(["yesterday", 2]), (datetime, int)),
+    (raw_cursor(["2024-05-01T08:30:00", "2"]), (datetime, int)),
+    (raw_cursor(["2024-05-01T08:30:00", True]), (datetime, int)),
+    (raw_cursor([5]), (str,)),
+    (raw_cursor([1.5]), (int,)),
+    (raw_cursor([None]), (int,)),
+])
+def test_invalid_cursor_raises_value_error(cursor, types):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, *types)
+
+
+def test_page_size():
+    assert page_size(None) == settings.PAGE_SIZE_DEFAULT
+    assert page_size(0) == settings.PAGE_SIZE_DEFAULT
+    assert page_size(10) == 10
+    assert page_size(settings.PAGE_SIZE_MAX + 1) == settings.PAGE_SIZE_MAX
+
+
+def test_split_page_without_limit_returns_everything():
+    assert split_page([1, 2, 3], None, lambda row: (row,)) == ([1, 2, 3], None)
+
+
+def test_split_page_last_page_has_no_cursor():
+    assert split_page([1, 2], 2, lambda row: (row,)) == ([1, 2], None)
+
+
+def test_split_page_returns_cursor_of_last_row():
+    rows, cursor = split_page([1, 2, 3], 2, lambda row: (row,))
+    assert rows == [1, 2]
+    assert decode_cursor(cursor, int) == [2]
+
+
+def test_parking_lot_pages_cover_every_row_once_with_tied_entry_times(db):
+    from app.models.parking_lot import ParkingLot
+    from app.models.registered_vehicle import RegisteredVehicle
+    from app.services.parking_lot_service import ParkingLotService
+
+    entry_time = datetime(2024, 5, 1, 8, 0)
+    for i in range(7):
+        db.add(RegisteredVehicle(license_plate=f"30A0000{i}", owner_name="Owner", phone_number="0900000000"))
+        db.add(ParkingLot(license_plate=f"30A0000{i}", entry_time=entry_time, exit_time=entry_time))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        records, cursor = ParkingLotService.list_parking_lot(db, 3, cursor)
+        seen.extend(record.id for record in records)
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 7
+    all_records, no_cursor = ParkingLotService.list_parking_lot(db, None)
+    assert len(all_records) == 7 and no_cursor is None
+
+
+def test_list_route_without_limit_returns_default_page(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.core.pagination import NEXT_CURSOR_HEADER
+    from app.main import app
+    from app.models.registered_vehicle import RegisteredVehicle
+
+    monkeypatch.setattr(settings, "PAGE_SIZE_DEFAULT", 3)
+    for i in range(5):
+        db.add(RegisteredVehicle(license_plate=f"30A0000{i}", owner_name="Owner", phone_number="0900000000"))
+    db.commit()
+
+    client = TestClient(app)
+    response = client.get("/registered_vehicle/vehicles")
+    assert response.status_code == 200
+    assert [vehicle["license_plate"] for vehicle in response.json()] == ["30A00000", "30A00001", "30A00002"]
+    response = client.get("/registered_vehicle/vehicles", params={"cursor": response.headers[NEXT_CURSOR_HEADER]})
+    assert [vehicle["license_plate"] for vehicle in response.json()] == ["30A00003", "30A00004"]
+    assert NEXT_CURSOR_HEADER not in response.headers
@@ -0,0 +1,66 @@
+from function.plate_match import PlateMatcher, apply_positional_rules, plate_distance
+
+
+class FakePlateSource:
+    def __init__(self, *plates):
+        self._plates = list(plates)
+        self.version = 1
+
+    def plates(self):
+        return list(self._plates)
+
+    def add(self, plate):
+        self._plates.append(plate)
+        self.version += 1
+
+
+def test_plate_distance_weights():
+    assert plate_distance("30A12345", "30A12345") == 0
+    assert plate_distance("30A12345", "3OA12345") == 1  # 0 / O dễ nhầm
+    assert plate_distance("30A12345", "30A12395") == 3  # đổi ký tự khác
+    assert plate_distance("30A12345", "30A1234") == 3  # thiếu 1 ký tự
+
+
+def test_positional_rules_fix_character_class():
+    assert apply_positional_rules("3OA1Z34S") == "30A12345"
+    assert apply_positional_rules("300") == "300"
+
+
+def test_exact_and_confusable_readings():
+    matcher = PlateMatcher(FakePlateSource("30A12345", "ABC123"), max_distance=2)
+    assert matcher.match("30A12345") == ("30A12345", 0)
+    # Không đúng định dạng biển số Việt Nam nên không sửa theo vị trí: 8 / B tốn 1
+    assert matcher.match("A8C123") == ("ABC123", 1)
+
+
+def test_returned_distance_is_the_one_used_for_the_decision():
+    matcher = PlateMatcher(FakePlateSource("50A12345"), max_distance=2)
+    # Chuỗi gốc cách 4 (4 ký tự dễ nhầm) nhưng sau khi sửa theo vị trí thì trùng khớp
+    plate, distance = matcher.match("SOA1Z34S")
+    assert plate == "50A12345"
+    assert distance == 0 <= matcher.max_distance
+
+
+def test_too_far_returns_none():
+    matcher = PlateMatcher(FakePlateSource("30A12345"), max_distance=2)
+    assert matcher.match("30A12395") is None
+    assert matcher.match("99Z99999") is None
+
+
+def test_edit_within_max_distance():
+    matcher = PlateMatcher(FakePlateSource("30A12345"), max_distance=3)
+    assert matcher.match("30A12395") == ("30A12345", 3)
+
+
+def test_ambiguous_match_returns_none():
+    matcher = PlateMatcher(FakePlateSource("30A12345", "30A12346"), max_distance=3)
+    assert matcher.match("30A1234") is None
+
+
+def test_index_is_rebuilt_when_source_version_changes():
+    source = FakePlateSource("30A12345")
+    matcher = PlateMatcher(source, max_distance=2)
+    assert matcher.match("51G67890") is None
+    source.add("51G67890")
+    matcher._rebuild()
+    assert matcher.match("51G67890") == ("51G67890", 0)
@@ -0,0 +1,94 @@
+import math
+import cv2
+import numpy as np
+import pytest
+from function.utils_rotate import compute_skew, deskew, deskew_variants, hough_lines, skew_from_lines
+
+VARIANT_ARGS = [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def baseline_skew_from_lines(lines, center_thres):
+    # Vòng lặp cũ của compute_skew (trước khi vector hoá), giữ nguyên để so kết quả
+    if lines is None:
+        return 1
+
+    min_line = 100
+    min_line_pos = 0
+    for i in range (len(lines)):
+        for x1, y1, x2, y2 in lines[i]:
+            center_point = [((x1+x2)/2), ((y1+y2)/2)]
+            if center_thres == 1:
+                if center_point[1] < 7:
+                    continue
+            if center_point[1] < min_line:
+                min_line = center_point[1]
+                min_line_pos = i
+
+    angle = 0.0
+    cnt = 0
+    for x1, y1, x2, y2 in lines[min_line_pos]:
+        ang = np.arctan2(y2 - y1, x2 - x1)
+        if math.fabs(ang) <= 30: # excluding extreme rotations
+            angle += ang
+            cnt += 1
+    if cnt == 0:
+        return 0.0
+    return (angle / cnt)*180/math.pi
+
+
+def plate_image(angle, seed, size=(60, 200)):
+    # Biển số giả: nền tối, khung sáng và vài vạch ký tự, xoay một góc nhỏ
+    rng = np.random.default_rng(seed)
+    h, w = size
+    img = np.full((h, w, 3), 40, np.uint8)
+    cv2.rectangle(img, (10, 8), (w - 10, h - 8), (230, 230, 230), -1)
+    for x in range(25, w - 25, 18):
+        cv2.rectangle(img, (x, 18), (x + 8, h - 18), (20, 20, 20), -1)
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    img = cv2.warpAffine(img, matrix, (w, h), borderValue=(40, 40, 40))
+    noise = rng.integers(-15, 16, img.shape)
+    return np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def lines_array(*segments):
+    return np.array(segments, dtype=np.int32).reshape(-1, 1, 4)
+
+
+@pytest.mark.parametrize("lines", [
+    None,
+    lines_array((0, 20, 150, 30)),
+    lines_array((0, 50, 150, 40), (0, 20, 150, 25), (5, 21, 140, 24)),
+    lines_array((0, 2, 150, 6), (0, 30, 150, 10)),  # tâm y < 7: bị bỏ khi center_thres == 1
+    lines_array((0, 120, 150, 130), (0, 110, 150, 105)),  # mọi tâm y >= 100: lấy đường đầu tiên
+    lines_array((0, 3, 150, 4), (0, 1, 150, 2)),  # mọi tâm y < 7
+    lines_array((0, 40, 150, 30), (0, 6, 150, 8)),  # tâm y đúng bằng 7
+    lines_array((0, 120, 150, 125), (0, 100, 150, 100)),  # tâm y đúng bằng 100
+    lines_array((0, 40, 150, 40), (0, 30, 150, 50), (150, 40, 0, 40)),  # tâm y bằng nhau
+    lines_array((10, 10, 10, 90)),  # đường thẳng đứng
+])
+@pytest.mark.parametrize("center_thres", [0, 1])
+def test_skew_from_lines_matches_baseline(lines, center_thres):
+    assert skew_from_lines(lines, center_thres) == baseline_skew_from_lines(lines, center_thres)
+
+
+@pytest.mark.parametrize("angle", [-12, -5, 0, 3, 8])
+@pytest.mark.parametrize("center_thres", [0, 1])
+def test_compute_skew_on_images_matches_baseline(angle, center_thres):
+    img = plate_image(angle, seed=angle + 100)
+    assert compute_skew(img, center_thres) == baseline_skew_from_lines(hough_lines(img), center_thres)
+
+
+@pytest.mark.parametrize("angle", [-12, -5, 0, 3, 8])
+def test_deskew_variants_match_deskew(angle):
+    img = plate_image(angle, seed=angle + 200)
+    variants = deskew_variants(img)
+    assert len(variants) == len(VARIANT_ARGS)
+    for variant, (change_cons, center_thres) in zip(variants, VARIANT_ARGS):
+        assert np.array_equal(variant, deskew(img, change_cons, center_thres))
+
+
+def test_deskew_variants_without_lines():
+    # Ảnh phẳng: không có đường Hough, góc mặc định là 1 độ như trước
+    img = np.full((40, 120, 3), 128, np.uint8)
+    for variant, (change_cons, center_thres) in zip(deskew_variants(img), VARIANT_ARGS):
+        assert np.array_equal(variant, deskew(img, change_cons, center_thres))
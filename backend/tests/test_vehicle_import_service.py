@@ -0,0 +1,110 @@
+import io
+import pytest
+from openpyxl import Workbook
+from app.models.registered_vehicle import RegisteredVehicle
+from app.models.registered_vehicle_change import RegisteredVehicleChange
+from app.services.vehicle_import_service import IMAGE_DIR, VehicleImportService
+
+IMAGES = {"30A12345": "30A12345.jpg", "51G67890": "51G67890.png"}
+
+
+def row(plate="30A12345", owner="Nguyen Van A", phone="0912345678", company="ABC", floor=3, image=None):
+    return (plate, owner, phone, company, floor, plate if image is None else image)
+
+
+def new_report():
+    return {"total_rows": 0, "inserted": 0, "skipped": 0, "failed": 0, "errors": []}
+
+
+def test_parse_valid_row():
+    values = VehicleImportService.parse_row(row(floor="3"), IMAGES)
+    assert values == {
+        "license_plate": "30A12345",
+        "owner_name": "Nguyen Van A",
+        "phone_number": "0912345678",
+        "company": "ABC",
+        "floor_number": 3,
+        "image_path": f"{IMAGE_DIR}/30A12345.jpg",
+        "normalized_plate": "30A12345",
+    }
+
+
+@pytest.mark.parametrize("bad_row, message", [
+    (row(plate="30A1", image="30A1"), "license_plate"),  # ngắn hơn 6 ký tự như VehicleCreate
+    (row(phone="091234"), "phone_number"),  # ngắn hơn 10 số
+    (row(phone=None), "phone_number"),
+    (row(owner=None), "owner_name"),
+    (row(floor="tầng 3"), "floor_number"),
+    (row(image="other"), "image_path"),
+    (row(image=""), "image_path"),
+    (row(plate="99Z99999"), "Không tìm thấy file ảnh"),
+])
+def test_parse_invalid_row(bad_row, message):
+    with pytest.raises(ValueError, match=message):
+        VehicleImportService.parse_row(bad_row, {**IMAGES, "30A1": "30A1.jpg"})
+
+
+def test_phone_cell_text_keeps_leading_zero_from_number_format():
+    assert VehicleImportService.cell_text(912345678, "0000000000") == "0912345678"
+    assert VehicleImportService.cell_text(912345678.0, "0000000000") == "0912345678"
+    assert VehicleImportService.cell_text(912345678, "General") == "912345678"
+    assert VehicleImportService.cell_text(" 0912345678 ") == "0912345678"
+
+
+def test_numeric_phone_without_leading_zero_is_rejected():
+    with pytest.raises(ValueError, match="phone_number"):
+        VehicleImportService.parse_row(row(phone=912345678), IMAGES)
+
+
+def test_insert_chunk_skips_existing_and_records_changes(db):
+    db.add(RegisteredVehicle(license_plate="30A-123.45", owner_name="Old", phone_number="0900000000"))
+    db.commit()
+    rows = [(2, VehicleImportService.parse_row(row(), IMAGES)),
+            (3, VehicleImportService.parse_row(row(plate="51G67890"), IMAGES))]
+    report = new_report()
+
+    inserted = VehicleImportService.insert_chunk(db, rows, report)
+
+    assert [values["license_plate"] for values in inserted] == ["51G67890"]
+    assert report["skipped"] == 1 and report["failed"] == 0
+    assert db.get(RegisteredVehicle, "51G67890").normalized_plate == "51G67890"
+    assert [change.license_plate for change in db.query(RegisteredVehicleChange)] == ["51G67890"]
+
+
+def test_insert_chunk_falls_back_to_rows_on_conflict(db):
+    values = VehicleImportService.parse_row(row(), IMAGES)
+    report = new_report()
+    # Cùng khoá chính trong 1 chunk: insert hàng loạt lỗi, insert lại từng dòng
+    inserted = VehicleImportService.insert_chunk(db, [(2, values), (3, dict(values))], report)
+    assert len(inserted) == 1
+    assert report["failed"] == 1 and report["errors"][0]["row"] == 3
+    assert db.query(RegisteredVehicle).count() == 1
+
+
+def test_import_excel_reports_errors_per_row(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / IMAGE_DIR).mkdir(parents=True)
+    for filename in IMAGES.values():
+        (tmp_path / IMAGE_DIR / filename).touch()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["license_plate", "owner_name", "phone_number", "company", "floor_number", "image_path"])
+    sheet.append(row(phone=912345678))
+    sheet["C2"].number_format = "0000000000"
+    sheet.append(row(plate="51G67890"))
+    sheet.append(row(plate="51-G678.90", image="51-G678.90"))
+    sheet.append(row(plate="99Z99999"))
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+
+    response = VehicleImportService.import_excel(file, db)
+
+    assert (response.status, response.total_rows, response.inserted, response.failed) == ("partial", 4, 2, 2)
+    assert [error.row for error in response.errors] == [4, 5]
+    assert db.get(RegisteredVehicle, "30A12345").phone_number == "0912345678"
+
+
+def test_import_excel_rejects_non_excel_file(db):
+    with pytest.raises(ValueError):
+        VehicleImportService.import_excel(io.BytesIO(b"not an excel file"), db)
@@ -4,6 +4,8 @@ import 'package:flutter_dotenv/flutter_dotenv.dart';
 
 class ParkingService {
   final baseUrl = dotenv.env['BASE_URL'] ?? 'http://default-url.com';
+  // Số bản ghi mỗi trang (backend giới hạn tối đa PAGE_SIZE_MAX = 500)
+  static const int pageSize = 500;
   // Lấy danh sách bãi đỗ
   Future<List<dynamic>> getParking() async {
     try {
@@ -21,17 +23,25 @@ class ParkingService {
     }
   }
 
+  // Lấy toàn bộ lịch sử gửi xe: đọc lần lượt các trang theo header X-Next-Cursor
   Future<List<dynamic>> getAllParking() async {
     try {
-      final response = await http.get(
-        Uri.parse('$baseUrl/parking-lot/'),
-      );
-      if (response.statusCode == 200) {
-        final jsonData = json.decode(response.body);
-        return jsonData as List<dynamic>;
-      } else {
-        throw Exception('Lỗi server: ${response.statusCode}');
-      }
+      final records = <dynamic>[];
+      String? cursor;
+      do {
+        final response = await http.get(
+          Uri.parse('$baseUrl/parking-lot/').replace(queryParameters: {
+            'limit': '$pageSize',
+            if (cursor != null) 'cursor': cursor,
+          }),
+        );
+        if (response.statusCode != 200) {
+          throw Exception('Lỗi server: ${response.statusCode}');
+        }
+        records.addAll(json.decode(response.body) as List<dynamic>);
+        cursor = response.headers['x-next-cursor'];
+      } while (cursor != null);
+      return records;
     } catch (e) {
       throw Exception('Lỗi khi lấy danh sách bãi đỗ: $e');
     }
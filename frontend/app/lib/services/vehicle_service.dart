@@ -7,6 +7,8 @@ import 'package:flutter_dotenv/flutter_dotenv.dart';
 
 class VehicleService {
   final baseUrl = dotenv.env['BASE_URL'] ?? 'http://default-url.com';
+  // Số phương tiện mỗi trang (backend giới hạn tối đa PAGE_SIZE_MAX = 500)
+  static const int pageSize = 500;
 
   Future<bool> checkVehicleExists(String licensePlate) async {
     String cleanPlate = licensePlate.replaceAll(RegExp(r'[^a-zA-Z0-9]'), '');
@@ -76,18 +78,27 @@ class VehicleService {
     }
   }
 
+  // Lấy toàn bộ phương tiện: đọc lần lượt các trang theo header X-Next-Cursor
   static Future<List<VehicleInfo>> fetchVehicles() async {
     final baseUrl = dotenv.env['BASE_URL'] ?? 'http://default-url.com';
-    final response = await http.get(
-      Uri.parse('$baseUrl/registered_vehicle/vehicles'),
-    );
+    final vehicles = <VehicleInfo>[];
+    String? cursor;
+    do {
+      final response = await http.get(
+        Uri.parse('$baseUrl/registered_vehicle/vehicles').replace(queryParameters: {
+          'limit': '$pageSize',
+          if (cursor != null) 'cursor': cursor,
+        }),
+      );
 
-    if (response.statusCode == 200) {
+      if (response.statusCode != 200) {
+        throw Exception('Failed to load vehicles');
+      }
       final List<dynamic> vehiclesJson = jsonDecode(response.body);
-      return vehiclesJson.map((json) => VehicleInfo.fromJson(json)).toList();
-    } else {
-      throw Exception('Failed to load vehicles');
-    }
+      vehicles.addAll(vehiclesJson.map((json) => VehicleInfo.fromJson(json)));
+      cursor = response.headers['x-next-cursor'];
+    } while (cursor != null);
+    return vehicles;
   }
 
   static Future<VehicleInfo> fetchVehicleByPlate(String plate) async {